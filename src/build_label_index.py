@@ -0,0 +1,33 @@
+import argparse
+import logging
+import sys
+
+from pymongo import MongoClient
+
+import config
+from utils.label_index import build_label_index, iter_dump
+from utils.utils import wikidata_projection
+
+
+def wikidata_entities(lang):
+    client = MongoClient(config.MONGO_IP, config.MONGO_PORT)
+    db = client[config.DB]
+    wikidata = db[config.WIKIDATA_COLLECTION]
+    return wikidata.find({}, wikidata_projection(lang), no_cursor_timeout=True)
+
+
+if __name__ == '__main__':
+    logging.basicConfig(format='%(asctime)s - %(module)s - %(levelname)s - %(message)s', level=logging.INFO)
+    logging.info("Running %s", " ".join(sys.argv))
+
+    parser = argparse.ArgumentParser(description="Builds the label index of the Wikidata entities.")
+    parser.add_argument('-l', '--lang', help='Language of the labels', default=config.LANG)
+    parser.add_argument('-o', '--out', help='Output folder of the index', required=True)
+    parser.add_argument('-d', '--dump', help='Wikidata JSON dump, the Wikidata collection is used when missing')
+
+    args = parser.parse_args()
+
+    entities = iter_dump(args.dump) if args.dump else wikidata_entities(args.lang)
+    indexed = build_label_index(entities, args.lang, args.out)
+    logging.info("Indexed {} entities".format(indexed))
+    logging.info("Completed %s", " ".join(sys.argv))
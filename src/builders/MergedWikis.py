@@ -1,10 +1,14 @@
 import collections
+import logging
 import re
 import traceback
 from typing import Dict, List
 
 from builders.builder import Builder
 from utils.date_formatter import DateFormatterFactory
+from utils.entity_cache import EntityCache
+from utils.label_index import LabelIndex
+from utils.utils import language_value, wikidata_projection
 
 NO_UNIT = {'label': '', 'id': ''}
 
@@ -22,28 +26,111 @@ DOC_CLEAN_KEYS = ['type', 'datatype', 'descriptions', 'claims', 'labels', 'sitel
 
 
 class MergedWikisBuilder(Builder):
-    def __init__(self, ip, port, db, wikipedia, wikidata, destination, lang, locale):
+    def __init__(self, ip, port, db, wikipedia, wikidata, destination, lang, locale, entity_cache_size=100000,
+                 entity_cache_path=None, label_index_path=None):
         super().__init__(ip, port, db, wikipedia, destination)
-        self._wikidata = db[wikidata]
+        self._wikidata = self._db[wikidata]
         self._prop_cache = {}
+        self._entity_cache = EntityCache(entity_cache_size, entity_cache_path)
+        self._label_index = LabelIndex(label_index_path) if label_index_path else None
         self._lang = lang
+        self._entity_projection = wikidata_projection(lang)
+        self._subject_projection = wikidata_projection(lang, claims=True)
         self._date_formatter = DateFormatterFactory.get_formatter(lang, locale)
         self._stop_sections_re = re.compile("===?\s({})\s===?".format('|'.join(STOP_SECTIONS.get(lang, []))))
 
+    def _stats_components(self):
+        return [self._entity_cache]
+
     def _build(self, doc, **kwargs):
-        wikidata_doc = self._wikidata.find_one({"id": doc['wikidata_id']}, {"_id": 0})
+        wikidata_doc = self._wikidata.find_one({"id": doc['wikidata_id']}, self._subject_projection)
+
+        self._cache_properties(set(wikidata_doc['claims'].keys()))
+        object_documents_ids = self._get_objects_id(wikidata_doc['claims'])
+        documents_dict = self._get_objects(object_documents_ids)
+
+        return self._merge(doc, wikidata_doc, documents_dict)
+
+    def _build_batch(self, docs, **kwargs):
+        """
+        Builds a batch of Wikipedia articles resolving the Wikidata entities, the properties and the claims objects
+        of the whole batch with one query each
+        :param docs:
+        :return:
+        """
+        wikidata_ids = [doc['wikidata_id'] for doc in docs]
+        wikidata_docs = self._documents_to_dict(self._wikidata.find({"id": {"$in": wikidata_ids}},
+                                                                    self._subject_projection))
+
+        properties_ids = set()
+        object_documents_ids = set()
+        for wikidata_id, wikidata_doc in list(wikidata_docs.items()):
+            # An entity without claims loses only its own article, not the whole batch
+            claims = wikidata_doc.get('claims')
+            if not isinstance(claims, dict):
+                logging.warning("Skipping {}, the claims are not a dict: {!r}".format(wikidata_id, claims))
+                del wikidata_docs[wikidata_id]
+                continue
+            properties_ids.update(claims.keys())
+            object_documents_ids.update(self._get_objects_id(claims))
+
+        self._cache_properties(properties_ids)
+        documents_dict = self._get_objects(list(object_documents_ids))
+
+        for doc in docs:
+            if doc['wikidata_id'] not in wikidata_docs:
+                continue
+            try:
+                yield self._merge(doc, wikidata_docs[doc['wikidata_id']], documents_dict)
+            except:
+                traceback.print_exc()
 
-        properties_ids = set(wikidata_doc['claims'].keys())
+    def _cache_properties(self, properties_ids):
+        """
+        Retrieves the properties that are not already in the cache and adds them to it
+        :param properties_ids:
+        :return:
+        """
         uncached_prop_ids = list(properties_ids - set(self._prop_cache.keys()))
-        prop_docs = list(self._wikidata.find({"id": {"$in": uncached_prop_ids}}, {"_id": 0}))
-        uncached_prop = list(self._clean_wikidata_docs(prop_docs))
-        list_prop = self._documents_to_dict(uncached_prop)
-        self._prop_cache.update(list_prop)
+        if not uncached_prop_ids:
+            return
+        self._prop_cache.update(self._fetch_entities(uncached_prop_ids))
 
-        object_documents_ids = self._get_objects_id(wikidata_doc['claims'])
-        object_documents = self._wikidata.find({"id": {"$in": object_documents_ids}}, {"_id": 0})
-        documents_dict = self._documents_to_dict(self._clean_wikidata_docs(object_documents))
+    def _get_objects(self, object_documents_ids: List) -> Dict[str, Dict]:
+        """
+        Retrieves the cleaned documents of the claims objects, from the entity cache when possible
+        :param object_documents_ids:
+        :return:
+        """
+        documents_dict, missing_ids = self._entity_cache.get_many(object_documents_ids)
+        if not missing_ids:
+            return documents_dict
+        uncached_documents = self._fetch_entities(missing_ids)
+        self._entity_cache.update(uncached_documents)
+        documents_dict.update(uncached_documents)
+        return documents_dict
+
+    def _fetch_entities(self, ids: List) -> Dict[str, Dict]:
+        """
+        Retrieves the cleaned entities from the label index when available, from the Wikidata collection otherwise.
+        The index contains all the entities with a label in the language, so the ones missing from it are skipped
+        :param ids:
+        :return:
+        """
+        if self._label_index:
+            documents_dict, _ = self._label_index.get_documents(ids)
+            return documents_dict
+        documents = self._wikidata.find({"id": {"$in": ids}}, self._entity_projection)
+        return self._documents_to_dict(self._clean_wikidata_docs(documents))
 
+    def _merge(self, doc: Dict, wikidata_doc: Dict, documents_dict: Dict[str, Dict]) -> Dict:
+        """
+        Merges a Wikipedia article with the facts of its Wikidata entity
+        :param doc:
+        :param wikidata_doc:
+        :param documents_dict: The cleaned documents of the claims objects
+        :return:
+        """
         facts = collections.defaultdict(list)
         for prop_id in wikidata_doc['claims']:
             for claim in wikidata_doc['claims'][prop_id]:
@@ -84,7 +171,7 @@ class MergedWikisBuilder(Builder):
         merged_document['properties'] = {pid: self._prop_cache[pid] for pid in facts if pid in self._prop_cache}
         merged_document['facts'] = {pid: facts[pid] for pid in facts if pid in self._prop_cache}
 
-        return merged_document
+        return {"document": merged_document, "stats": {}}
 
     def _clean_wikidata_docs(self, docs: List[Dict]) -> List[Dict]:
         """
@@ -106,10 +193,11 @@ class MergedWikisBuilder(Builder):
         :param doc:
         :return:
         """
-        doc['label'] = doc['labels'][self._lang]['value']
-        aliases = doc['aliases'][self._lang] if self._lang in doc['aliases'] else []
-
-        doc['aliases'] = [alias['value'] for alias in aliases]
+        label = language_value(doc, 'labels', self._lang)
+        if label is None:
+            raise KeyError("{} has no label in {}".format(doc.get('id'), self._lang))
+        doc['label'] = label['value']
+        doc['aliases'] = [alias['value'] for alias in language_value(doc, 'aliases', self._lang, [])]
 
         for key in DOC_CLEAN_KEYS:
             try:
@@ -1,28 +1,32 @@
 import csv
 import hashlib
-import itertools
 import json
 import logging
-import re
+import multiprocessing
+import os
+import shutil
 import traceback
 from collections import defaultdict
+from contextlib import ExitStack
+from functools import partial
 
-import nltk
 from pymongo import MongoClient
 
 import config
 from utils.article_extractors import ArticleExtractorFactory
-from builders.builder import Builder
+from builders.segmented import SegmentedBuilder
+from utils.distant_supervision import first_sentences
+from utils.negative_sampling import answers_in_sentences, negative_pairs
 from utils.template_fillers import TemplateFillerFactory
-from utils import load_props
+from utils.utils import get_chunks, load_props
 
 
-class QABuilder(Builder):
-    def __init__(self, ip, port, db, source, destination, language):
-        super().__init__(ip, port, db, source, destination)
+class QABuilder(SegmentedBuilder):
+    def __init__(self, ip, port, db, source, destination, language, sentence_collection=None, max_negatives=None):
+        super().__init__(ip, port, db, source, destination, language, sentence_collection)
         self._language = language
+        self._max_negatives = max_negatives
         self._article_extractor = ArticleExtractorFactory.make_extractor(language)
-        self._tokenizer = nltk.sent_tokenize
 
     def _build(self, doc, **kwargs):
         pos_count = 0
@@ -31,10 +35,13 @@ class QABuilder(Builder):
         if not text:
             return {}
 
-        sentences = self._tokenizer(text.replace("\n\n", "\n"), language=self._language)
+        sentences = self._sentences(doc, **kwargs)
         qa_doc = {"id": doc['id'], "text": doc['text'], "label": doc['label'], 'QA': {},
                     'entity_article': self._article_extractor.extract(doc['text'], doc['label'])}
 
+        answers = {fact['value'] for prop in doc['facts'] for fact in doc['facts'][prop]}
+        answers_sentences = self._distant_supervision(answers, qa_doc['label'], sentences)
+
         qas = defaultdict(list)
         for prop in doc['facts']:
             relation = doc['properties'][prop]
@@ -43,12 +50,11 @@ class QABuilder(Builder):
             for fact in doc['facts'][prop]:
                 answer = fact['value']
 
-                sentence = self._distant_supervision(answer, qa_doc['label'], sentences)
-
-                if not sentence:
+                if answer not in answers_sentences:
                     continue
 
-                qa = {"relation": relation['label'], "sentence": sentence,
+                sentence, answer_start = answers_sentences[answer]
+                qa = {"relation": relation['label'], "sentence": sentence, "answer_start": answer_start,
                       "answer": fact['value'], "id": self._get_id_for_qa(doc['id'], prop, fact['id']),
                       "answer_id": fact['id'], "prop_id": prop,
                       "type": fact['type'], "example": "positive"}
@@ -74,37 +80,32 @@ class QABuilder(Builder):
         return hashlib.sha1(unique_str.encode("utf-8")).hexdigest()
 
     @staticmethod
-    def _distant_supervision(answer, entity, sentences):
-        e_template = "\\b" + re.escape(entity) + "\\b"
-        a_template = "\\b" + re.escape(answer) + "\\b"
-        for sentence in sentences:
-            if re.search(e_template, sentence) and re.search(a_template, sentence):
-                return sentence
-
-        return False
+    def _distant_supervision(answers, entity, sentences):
+        """
+        Finds for each answer the first sentence that contains both the entity and the answer
+        :param answers:
+        :param entity:
+        :param sentences:
+        :return: A dict with the sentence, and the character offset of the answer in it, of each answer found
+        """
+        return first_sentences(entity, answers, sentences, offsets=True)
 
     def _create_negatives(self, qas):
         neg_examples = []
         for type in qas:
-            combinations = itertools.combinations(qas[type], 2)
-            for a, b in combinations:
-                negative = self._create_negative(a, b)
-                if negative:
-                    neg_examples.append(negative)
+            examples = qas[type]
+            found = answers_in_sentences(examples)
+            seed = examples[0]['id']
+            for i, j in negative_pairs(examples, found, self._max_negatives, seed):
+                neg_examples.append(self._create_negative(examples[i], examples[j]))
 
         return neg_examples
 
     def _create_negative(self, a, b):
-        if a['prop_id'] == b['prop_id']:
-            return {}
-        e_template = "\\b" + re.escape(a['answer']) + "\\b"
-        if not re.search(e_template, b['sentence']):
-            neg_a = {"relation": a['relation'], "sentence": b['sentence'],
-                     "answer": "", "id": self._get_id_for_qa(a['id'], a['prop_id'], b['id']),
-                     "answer_id": 0, "prop_id": a['prop_id'],
-                     "type": a['type'], "example": "negative", "source_a": a['id'], "source_b": b['id']}
-            return neg_a
-        return {}
+        return {"relation": a['relation'], "sentence": b['sentence'],
+                "answer": "", "id": self._get_id_for_qa(a['id'], a['prop_id'], b['id']),
+                "answer_id": 0, "prop_id": a['prop_id'],
+                "type": a['type'], "example": "negative", "source_a": a['id'], "source_b": b['id']}
 
 
 def read_questions_templates(path):
@@ -117,52 +118,134 @@ def read_questions_templates(path):
     return templates
 
 
-def extract_examples(example_type):
-    client = MongoClient(config.MONGO_IP, config.MONGO_PORT)
-    db = client[config.DB]
-    wikipedia = db[config.QA_COLLECTION]
-    documents = wikipedia.find({}, {"QA": 1, "id": 1, "label": 1, "entity_article": 1, "_id": 0})
-
-    levy_props = load_props()
-
-    template_filler = TemplateFillerFactory.make_filler(config.LANG)
-
-    question_templates = read_questions_templates(
-        "resources/templates/templates_translation_{}.csv".format(config.LANG))
-
-    with open("{}_qa_{}.json".format(config.LANG, example_type), "wt", encoding="utf8", newline="") as outf:
-        i = 0
+class ExampleExtractor(object):
+    """
+    Turns the question answers of the QA documents into examples, one for each question template of the property
+    """
+
+    def __init__(self, lang):
+        self._levy_props = load_props()
+        self._template_filler = TemplateFillerFactory.make_filler(lang)
+        self._question_templates = read_questions_templates(
+            "resources/templates/templates_translation_{}.csv".format(lang))
+
+    def extract(self, documents, outfs):
+        """
+        Writes the examples of the documents, in a single pass, to the file of their type
+        :param documents:
+        :param outfs: A dict with the example types to extract as keys, and the files where they are written as value
+        :return: The number of skipped question answers
+        """
+        skipped = 0
         for document in documents:
             for prop in document['QA']:
-                if prop not in levy_props:
+                if prop not in self._levy_props:
                     continue
                 for qa in document['QA'][prop]:
-                    if example_type and qa['example'] == example_type:
-                        for template in question_templates[prop]:
-                            question = template_filler.fill(template, document['label'],
-                                                            article=document['entity_article'])
-                            example = {'context': qa['sentence'], 'id': qa['id'], 'prop_id': qa['prop_id'],
-                                       'property': qa['relation'], 'template': template, 'entity': document['label'],
-                                       'answer': qa['answer'], 'question': question, 'entity_id': document['id']}
-                            if example_type == "positive":
-                                try:
-                                    context = example['context']
-                                    answer_text = example['answer']
+                    example_type = qa['example']
+                    if example_type not in outfs:
+                        continue
+                    for template in self._question_templates[prop]:
+                        question = self._template_filler.fill(template, document['label'],
+                                                              article=document['entity_article'])
+                        example = {'context': qa['sentence'], 'id': qa['id'], 'prop_id': qa['prop_id'],
+                                   'property': qa['relation'], 'template': template, 'entity': document['label'],
+                                   'answer': qa['answer'], 'question': question, 'entity_id': document['id']}
+                        if example_type == "positive":
+                            try:
+                                context = example['context']
+                                answer_text = example['answer']
+                                start_index = qa.get('answer_start')
+                                if start_index is None:
                                     start_index = context.index(answer_text)
-                                    end_index = start_index + len(answer_text)
-                                    assert end_index <= len(context)
-                                except:
-                                    traceback.print_exc()
-                                    i += 1
-                                    logging.info(
-                                        "Answer: {} ---- Context: {}".format(example['answer'], example['context']))
-                                    continue
-                                example['start_index'] = start_index
-                                example['end_index'] = end_index
-                                example['na'] = 1
-                            else:
-                                example['start_index'] = -1
-                                example['end_index'] = -1
-                                example['na'] = 0
-                            outf.write(json.dumps(example, ensure_ascii=False) + "\n")
-        logging.info("Skipped {} question/answers".format(i))
+                                end_index = start_index + len(answer_text)
+                                assert end_index <= len(context)
+                            except:
+                                traceback.print_exc()
+                                skipped += 1
+                                logging.info(
+                                    "Answer: {} ---- Context: {}".format(example['answer'], example['context']))
+                                continue
+                            example['start_index'] = start_index
+                            example['end_index'] = end_index
+                            example['na'] = 1
+                        else:
+                            example['start_index'] = -1
+                            example['end_index'] = -1
+                            example['na'] = 0
+                        outfs[example_type].write(json.dumps(example, ensure_ascii=False) + "\n")
+        return skipped
+
+
+_extractor = None
+_collection = None
+
+
+def init_extractor():
+    """
+    Pool initializer, loads the templates and connects to the QA collection once per worker process
+    :return:
+    """
+    global _extractor, _collection
+    _extractor = ExampleExtractor(config.LANG)
+    _collection = MongoClient(config.MONGO_IP, config.MONGO_PORT)[config.DB][config.QA_COLLECTION]
+
+
+def extract_chunk(chunk, example_types, shards_path):
+    """
+    Extracts the examples of the documents of an id range to a shard file for each example type
+    :param chunk: The position of the chunk and its lower and upper limits
+    :param example_types:
+    :param shards_path: The folder of the shard files
+    :return: The position of the chunk, the paths of its shards and the number of skipped question answers
+    """
+    n, (lower, upper) = chunk
+    documents = _collection.find({"id": {"$gte": lower, "$lte": upper}},
+                                 {"QA": 1, "id": 1, "label": 1, "entity_article": 1, "_id": 0})
+    paths = {example_type: os.path.join(shards_path, "{}_{:06d}.json".format(example_type, n))
+             for example_type in example_types}
+    with ExitStack() as stack:
+        outfs = {example_type: stack.enter_context(open(path, "wt", encoding="utf8", newline=""))
+                 for example_type, path in paths.items()}
+        skipped = _extractor.extract(documents, outfs)
+    return n, paths, skipped
+
+
+def extract_examples(example_types=("positive", "negative"), num_workers=config.NUM_WORKERS):
+    """
+    Extracts the examples of the QA collection with a single pass. The collection is split in id ranges, read through
+    the index on id created if missing, that are extracted in parallel to shard files, which are then merged in order
+    in one file for each example type
+    :param example_types:
+    :param num_workers:
+    :return:
+    """
+    if isinstance(example_types, str):
+        example_types = [example_types]
+    client = MongoClient(config.MONGO_IP, config.MONGO_PORT)
+    wikipedia = client[config.DB][config.QA_COLLECTION]
+    # The chunks are planned on the sorted ids and read as id ranges, without an index both scan the collection
+    wikipedia.create_index("id")
+    chunks = get_chunks(wikipedia.find({}, {"id": 1, "_id": 0}).sort("id", 1), config.CHUNK_SIZE, 'id')
+
+    out_paths = {example_type: "{}_qa_{}.json".format(config.LANG, example_type) for example_type in example_types}
+    shards_path = "{}_qa_shards".format(config.LANG)
+    os.makedirs(shards_path, exist_ok=True)
+
+    shards = {}
+    skipped = 0
+    with multiprocessing.Pool(num_workers, initializer=init_extractor) as pool:
+        extract = partial(extract_chunk, example_types=list(example_types), shards_path=shards_path)
+        for n, paths, chunk_skipped in pool.imap_unordered(extract, enumerate(chunks)):
+            shards[n] = paths
+            skipped += chunk_skipped
+
+    for example_type, out_path in out_paths.items():
+        with open(out_path, "wb") as outf:
+            for n in sorted(shards):
+                with open(shards[n][example_type], "rb") as inf:
+                    shutil.copyfileobj(inf, outf)
+                os.remove(shards[n][example_type])
+    shutil.rmtree(shards_path, ignore_errors=True)
+    client.close()
+    logging.info("Skipped {} question/answers".format(skipped))
@@ -8,38 +8,53 @@ from ftfy import fix_text
 from sacremoses import MosesTokenizer
 from pymongo import MongoClient
 
-from builders.builder import Builder
+from builders.segmented import SegmentedBuilder
+from tokenizers.memoized_tokenizer import MemoizedTokenizer
+from tokenizers.utils import TokenOffsets, align_tokens
+from utils import matcher
+from utils.distant_supervision import SentenceIndex, boundary_pattern
 
 
-class SRLBuilder(Builder):
+class SRLBuilder(SegmentedBuilder):
 
-    def __init__(self, ip, port, db, source, destination, lang, language):
-        super().__init__(ip, port, db, source, destination)
-        self._sent_tokenizer = nltk.sent_tokenize
+    def __init__(self, ip, port, db, source, destination, lang, language, sentence_collection=None):
+        super().__init__(ip, port, db, source, destination, "english", sentence_collection)
         self._word_tokenizer = MosesTokenizer(lang)
+        self._memoized_tokenizer = MemoizedTokenizer(self._tokenize_text)
         self._pos_tagger = nltk.pos_tag
         self._language = language
 
+    def _stats_components(self):
+        return [self._memoized_tokenizer] + super()._stats_components()
+
     def _build(self, doc, **kwargs):
         text = doc['text'].strip()
         if not text:
             return {}
 
-        sentences = self._sent_tokenizer(text.replace("\n\n", "\n"), language="english")
+        sentences = self._sentences(doc, **kwargs)
         srl = {"id": doc['id'], "text": doc['text'], "label": doc['label'],
                "label_sequence": self._tokenize(doc['label']),
                'sentences': defaultdict(lambda: {"sentence": "", "sentence_sequence": [], "relations": []})}
 
+        index = SentenceIndex(sentences)
+        entity_re = re.compile(boundary_pattern(srl['label']))
+        entity_sentences = index.search(entity_re, index.candidates(srl['label']))
+
         extracted = 0
         skipped = 0
         seen = set()
+        offsets = {}
         for prop in doc['facts']:
             relation = doc['properties'][prop]
             prop_labels = relation.get('aliases', [])
             prop_labels.append(relation['label'])
+            r_template = "(?P<relation>" + "|".join([boundary_pattern(label) for label in prop_labels]) + ")"
+            relation_re = re.compile(r_template)
+            relation_sentences = entity_sentences & index.candidates_any(prop_labels)
             for fact in doc['facts'][prop]:
                 answer = fact['value']
-                sentence, sentence_relation = self._distant_supervision(answer, srl['label'], prop_labels, sentences)
+                sentence, sentence_relation = self._distant_supervision(answer, relation_re, relation_sentences, index)
 
                 if not sentence:
                     continue
@@ -60,19 +75,20 @@ class SRLBuilder(Builder):
                         continue
                     extracted += 1
                     srl['sentences'][sentence_id]['full_match_entity_location'] = entity_location
+                    offsets[sentence_id] = self._get_offsets(sentence, sentence_sequence)
                     seen.add(sentence_id)
                 else:
                     sentence_sequence = srl['sentences'][sentence_id]['sentence_sequence']
 
-                answer_sequence = self._tokenize(fact['value'])
-                answer_location = self.find_full_matches(sentence_sequence, answer_sequence)
+                answer_sequence, answer_location = self._locate(answer, sentence, sentence_sequence,
+                                                                offsets.get(sentence_id))
                 if not answer_location:
                     logging.error("Unable to find {} in sequence {}".format(answer_sequence, sentence_sequence))
                     skipped += 1
                     continue
 
-                relation_sequence = self._tokenize(sentence_relation)
-                relation_location = self.find_full_matches(sentence_sequence, relation_sequence)
+                relation_sequence, relation_location = self._locate(sentence_relation, sentence, sentence_sequence,
+                                                                    offsets.get(sentence_id))
                 if not relation_location:
                     logging.error("Unable to find {} in sequence {}".format(relation_sequence, sentence_sequence))
                     skipped += 1
@@ -91,13 +107,20 @@ class SRLBuilder(Builder):
         return {"document": srl, "stats": {"extracted": extracted, "skipped": skipped}}
 
     @staticmethod
-    def _distant_supervision(answer, entity, relations, sentences):
-        e_template = "\\b" + re.escape(entity) + "\\b"
-        a_template = "\\b" + re.escape(answer) + "\\b"
-        r_template = "(?P<relation>" + "|".join(["\\b" + re.escape(relation) + "\\b" for relation in relations]) + ")"
-        for sentence in sentences:
-            relation = re.search(r_template, sentence)
-            if re.search(e_template, sentence) and re.search(a_template, sentence) and relation:
+    def _distant_supervision(answer, relation_re, relation_sentences, index):
+        """
+        Finds the first sentence that contains the entity, the answer and one of the relation labels
+        :param answer:
+        :param relation_re: The alternation of the relation labels
+        :param relation_sentences: The ids of the sentences that contain the entity and may contain a relation label
+        :param index: The SentenceIndex of the document
+        :return: The sentence and the relation label found in it
+        """
+        a_template = re.compile(boundary_pattern(answer))
+        for i in sorted(relation_sentences & index.candidates(answer)):
+            sentence = index[i]
+            relation = relation_re.search(sentence)
+            if relation and a_template.search(sentence):
                 return sentence, relation.group("relation")
 
         return False, False
@@ -107,18 +130,53 @@ class SRLBuilder(Builder):
         return self._get_id(unique_str)
 
     def _tokenize(self, sentence):
+        return self._memoized_tokenizer.tokenize(sentence)
+
+    @staticmethod
+    def _get_offsets(sentence, sentence_sequence):
+        """
+        Aligns the tokens to the sentence, as it is tokenized
+        :param sentence:
+        :param sentence_sequence:
+        :return: The TokenOffsets of the sentence, None when the tokens are not found verbatim (e.g. escaped)
+        """
+        try:
+            return TokenOffsets(align_tokens(sentence_sequence, sentence.replace("\n", "")))
+        except ValueError:
+            return None
+
+    def _locate(self, string, sentence, sentence_sequence, offsets):
+        """
+        Finds the token locations of a string of the sentence. The character matches are mapped to the tokens with the
+        offsets, the string is tokenized and searched in the token sequence only when they are not available or
+        the matches do not fall on token boundaries
+        :param string:
+        :param sentence:
+        :param sentence_sequence:
+        :param offsets: The TokenOffsets of the sentence
+        :return: The token sequence of the string and the list of its locations
+        """
+        if offsets:
+            locations = []
+            for match in re.finditer(boundary_pattern(string), sentence.replace("\n", "")):
+                location = offsets.tokens(match.start(), match.end())
+                if location is None:
+                    break
+                locations.append(list(location))
+            else:
+                if locations:
+                    return sentence_sequence[locations[0][0]:locations[0][-1] + 1], locations
+
+        sequence = self._tokenize(string)
+        return sequence, self.find_full_matches(sentence_sequence, sequence)
+
+    def _tokenize_text(self, sentence):
         sentence = sentence.replace("\n", "")
         return [fix_text(t) for t in self._word_tokenizer.tokenize(sentence)]
 
     @staticmethod
     def find_full_matches(iterable, sublist):
-        results = []
-        sll = len(sublist)
-        for ind in (i for i, e in enumerate(iterable) if e == sublist[0]):
-            if iterable[ind:ind + sll] == sublist:
-                results.append(list(range(ind, ind + sll)))
-
-        return results
+        return matcher.find_full_matches(iterable, sublist, as_list=True)
 
 
 class SRLExporter(object):
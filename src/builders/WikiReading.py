@@ -1,56 +1,141 @@
 import logging
+import traceback
 
 import nltk
 
 from builders.builder import Builder
+from tokenizers.memoized_tokenizer import MemoizedTokenizer
+from utils import matcher
+from utils.vocabs import Vocabulary
 
 
 class WikiReadingBuilder(Builder):
-    def __init__(self, ip, port, db, source, destination, tokenizer):
+    def __init__(self, ip, port, db, source, destination, tokenizer, document_vocab_path=None,
+                 answer_vocab_path=None):
         super().__init__(ip, port, db, source, destination)
-        self._tokenizer = tokenizer
+        self._tokenizer = MemoizedTokenizer(tokenizer.tokenize, getattr(tokenizer, 'tokenize_batch', None))
         self._pos_tagger = nltk.pos_tag
+        self._document_vocab = Vocabulary.load(document_vocab_path) if document_vocab_path else None
+        self._answer_vocab = Vocabulary.load(answer_vocab_path) if answer_vocab_path else None
+
+    def _stats_components(self):
+        return [self._tokenizer]
 
     def _build(self, doc, **kwargs):
+        """
+        Builds the WikiReading document of an article. The document has the article fields (id, string_sequence,
+        break_levels, sentence_breaks, paragraph_breaks, document_sequence, type_sequence) and a 'questions' list with
+        one question for each property, with its prop_id and the question and answer fields. The former schema had the
+        question and answer fields at the top level, for the first property only
+        :param doc:
+        :return:
+        """
         text = doc['text'].strip()
         if not text:
             return {}
 
-        self._tokenize(doc)
-        wikireading_doc = {'answer_breaks': [], 'answer_ids': ['IDs'], 'answer_location': [],
-                           'answer_sequence': ['IDs'], 'answer_string_sequence': [], 'break_levels': [],
-                           'document_sequence': ['IDs'], 'full_match_answer_location': [],
-                           'paragraph_breaks': doc['paragraph_breaks'], 'question_sequence': ['IDs'],
-                           'question_string_sequence': [],
-                           'raw_answer_ids': ['IDs'], 'raw_answers': '', 'sentence_breaks': doc['sentence_breaks'],
-                           'string_sequence': doc['string_sequence'], 'type_sequence': ['IDs']}
+        self._tokenize(doc, kwargs.get('article'), kwargs.get('tokenized'))
+        wikireading_doc = {'id': doc['id'], 'break_levels': doc['break_levels'], 'document_sequence': ['IDs'],
+                           'paragraph_breaks': doc['paragraph_breaks'], 'sentence_breaks': doc['sentence_breaks'],
+                           'string_sequence': doc['string_sequence'], 'type_sequence': ['IDs'], 'questions': []}
 
+        # Out of vocabulary tokens are interned per document, so the matching on the ids stays exact
+        oov = {}
+        sequence = self._encode(doc['string_sequence'], oov)
+        for prop in doc['facts']:
+            for fact in doc['facts'][prop]:
+                fact['value_ids'] = self._encode(fact['value_sequence'], oov)
+        if self._document_vocab:
+            wikireading_doc['document_sequence'] = self._document_vocab.to_ids(sequence)
+
+        answers_matcher = matcher.SubsequenceMatcher(fact['value_ids'] for prop in doc['facts']
+                                                     for fact in doc['facts'][prop])
+        answers_locations = answers_matcher.find_all(sequence, as_list=True)
+
+        found = 0
         for prop in doc['facts']:
             question = doc['properties'][prop]
             answer_string_sequence = []
             answer_breaks = []
             raw_answers = []
+            raw_answer_sequences = []
             full_match_answer_location = []
             answer_location = []
+            answer_sequence = []
             for fact in doc['facts'][prop]:
                 if answer_string_sequence:
                     answer_breaks.append(len(answer_string_sequence))
                 raw_answers.append(fact['value'])
-                answer = fact['value_sequence']
-                answer_string_sequence += answer
-                full_match_answer_location += self.find_full_matches(wikireading_doc["string_sequence"], answer)
-                answer_location += self.find_matches(wikireading_doc["string_sequence"], answer)
-
-            wikireading_doc['answer_breaks'] = answer_breaks
-            wikireading_doc['answer_location'] = answer_location
-            wikireading_doc['answer_string_sequence'] = answer_string_sequence
-            wikireading_doc['full_match_answer_location'] = full_match_answer_location
-            wikireading_doc['question_string_sequence'] = question['label_sequence']
-            return wikireading_doc
-
-    def _tokenize(self, document):
+                raw_answer_sequences.append(fact['value_sequence'])
+                answer = fact['value_ids']
+                answer_string_sequence += fact['value_sequence']
+                answer_sequence += answer
+                full_match_answer_location += answers_locations.get(tuple(answer), [])
+                answer_location += self.find_matches(sequence, answer)
+
+            question_doc = {'prop_id': prop, 'answer_breaks': answer_breaks, 'answer_ids': ['IDs'],
+                            'answer_location': answer_location, 'answer_sequence': ['IDs'],
+                            'answer_string_sequence': answer_string_sequence,
+                            'full_match_answer_location': full_match_answer_location, 'question_sequence': ['IDs'],
+                            'question_string_sequence': question['label_sequence'], 'raw_answer_ids': ['IDs'],
+                            'raw_answers': raw_answers}
+            if self._document_vocab:
+                question_doc['answer_sequence'] = self._document_vocab.to_ids(answer_sequence)
+                question_sequence = self._document_vocab.encode(question['label_sequence'])
+                question_doc['question_sequence'] = question_sequence.tolist()
+            if self._answer_vocab:
+                question_doc['answer_ids'] = [self._answer_vocab.get(token) for token in answer_string_sequence]
+                # The answer vocabulary is built from the tokens of the answers, so each answer is encoded token by token
+                question_doc['raw_answer_ids'] = [self._answer_vocab.encode(tokens).tolist()
+                                                  for tokens in raw_answer_sequences]
+
+            if full_match_answer_location:
+                found += 1
+            wikireading_doc['questions'].append(question_doc)
+
+        return {"document": wikireading_doc, "stats": {"questions": len(wikireading_doc['questions']),
+                                                       "answers_found": found}}
+
+    def _build_batch(self, docs, **kwargs):
+        """
+        Tokenizes the articles and the labels and values of all the documents in the batch with two calls to the
+        tokenizer, then builds each document
+        :param docs:
+        :return:
+        """
+        articles = self._tokenizer.tokenize_batch([doc['text'].strip() for doc in docs])
+        strings = list(set(string for doc in docs for string in self._get_short_strings(doc)))
+        tokenized = dict(zip(strings, self._tokenizer.tokenize_batch(strings)))
+        for doc, article in zip(docs, articles):
+            try:
+                yield self._build(doc, article=article, tokenized=tokenized, **kwargs)
+            except:
+                traceback.print_exc()
+
+    @staticmethod
+    def _get_short_strings(document):
+        yield document['label']
+        for prop in document['properties']:
+            yield document['properties'][prop]['label']
+        for prop in document['facts']:
+            for fact in document['facts'][prop]:
+                yield fact['value']
+
+    def _tokenize_string(self, text, tokenized=None):
+        if tokenized and text in tokenized:
+            return tokenized[text]
+        return self._tokenizer.tokenize(text)
+
+    def _tokenize(self, document, article=None, tokenized=None):
+        """
+        Tokenizes the article, the label, the properties labels and the facts values of the document
+        :param document:
+        :param article: The article already tokenized, if available
+        :param tokenized: Dict of the strings already tokenized, if available
+        :return:
+        """
         article_text = document['text'].strip()
-        tokens, break_levels, _ = self._tokenizer.tokenize(article_text)
+        tokens, break_levels, _ = article if article else self._tokenizer.tokenize(article_text)
         document['string_sequence'] = tokens
         document['break_levels'] = break_levels
         document['sentence_breaks'] = [i for i, brk in enumerate(break_levels) if brk >= 3]
@@ -58,20 +143,31 @@ class WikiReadingBuilder(Builder):
 
         assert len(tokens) == len(break_levels)
 
-        tokens, _, _ = self._tokenizer.tokenize(document['label'])
+        tokens, _, _ = self._tokenize_string(document['label'], tokenized)
         document['label_sequence'] = tokens
 
         for prop in document['properties']:
-            tokens, _, _ = self._tokenizer.tokenize(document['properties'][prop]['label'])
+            tokens, _, _ = self._tokenize_string(document['properties'][prop]['label'], tokenized)
             document['properties'][prop]['label_sequence'] = tokens
 
         for prop in document['facts']:
             for fact in document['facts'][prop]:
-                tokens, _, _ = self._tokenizer.tokenize(fact['value'])
+                tokens, _, _ = self._tokenize_string(fact['value'], tokenized)
                 if len(tokens) == 0:
                     tokens = fact['value']
                 fact['value_sequence'] = tokens
 
+    def _encode(self, tokens, oov):
+        """
+        Encodes the tokens with the document vocabulary, the tokens are returned as they are without it
+        :param tokens:
+        :param oov:
+        :return:
+        """
+        if not self._document_vocab:
+            return tokens
+        return self._document_vocab.encode(tokens, oov)
+
     @staticmethod
     def find_matches(sequence, answer):
         elements = set(answer)
@@ -79,13 +175,7 @@ class WikiReadingBuilder(Builder):
 
     @staticmethod
     def find_full_matches(list, sublist):
-        results = []
-        sll = len(sublist)
-        for ind in (i for i, e in enumerate(list) if e == sublist[0]):
-            if list[ind:ind + sll] == sublist:
-                results.append(range(ind, ind + sll))
-
-        return results
+        return matcher.find_full_matches(list, sublist)
 
     @staticmethod
     def is_sublist(sublist, list):
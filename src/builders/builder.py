@@ -3,59 +3,109 @@ import time
 import traceback
 from abc import ABC, abstractmethod
 from collections import Counter
+from typing import List
 
 from pymongo import MongoClient
 
+from builders.writer import BulkWriter
+
 
 class Builder(ABC):
-    def __init__(self, ip, port, db, source, destination, batch_size=500):
+    def __init__(self, ip, port, db, source, destination, batch_size=500, batch_bytes=None, write_queue_size=4,
+                 write_concern=None):
         self._client = MongoClient(ip, port)
         self._db = self._client[db]
         self._source = self._db[source]
         self._destination = self._db[destination]
         self._batch_size = batch_size
+        self._batch_bytes = batch_bytes
+        self._write_queue_size = write_queue_size
+        self._write_concern = write_concern
 
     def build(self, limit, **kwargs):
-        n = 0
-        processed = []
         mask = kwargs['mask'] if 'mask' in kwargs else {"_id": 0}
         start_time = time.time()
+        components = self._stats_components()
+        for component in components:
+            component.reset_stats()
+        if kwargs.get('replace', False):
+            self._destination.delete_many(self._get_range_query(limit))
         counter = Counter()
-        for doc in self._get_source_iterator(limit, mask):
-            try:
-                result = self._build(doc)
-            except:
-                traceback.print_exc()
-                continue
-
-            if result:
-                document = result['document']
-                counter.update(result['stats'])
-                processed.append(document)
-                n += 1
-
-            if len(processed) >= self._batch_size:
-                self._destination.insert_many(processed, ordered=False, bypass_document_validation=True)
-                n += len(processed)
-                processed = []
-
-        if processed:
-            self._destination.insert_many(processed, ordered=False, bypass_document_validation=True)
-            n += len(processed)
+        writer = BulkWriter(self._destination, self._batch_size, self._batch_bytes, self._write_queue_size,
+                            self._write_concern)
+        with writer:
+            for batch in self._get_source_batches(limit, mask):
+                try:
+                    results = list(self._build_batch(batch))
+                except:
+                    traceback.print_exc()
+                    continue
+
+                for result in results:
+                    if result:
+                        counter.update(result['stats'])
+                        writer.write(result['document'])
+
         elapsed = int(time.time() - start_time)
-        res = {"processed": n, "elapsed": elapsed}
+        stats = writer.stats()
+        res = {"processed": stats.pop('queued'), "elapsed": elapsed}
+        res.update(stats)
         res.update(counter)
+        for component in components:
+            res.update(component.stats())
 
         return res
 
+    def _stats_components(self) -> List:
+        """
+        The components of the builder that count their own stats, e.g. the caches. The builder of a worker is reused
+        for many chunks, so their counters are reset at the start of each build and reported with its stats
+        :return: The components, with reset_stats and stats methods
+        """
+        return []
+
     @abstractmethod
     def _build(self, doc, **kwargs):
         return doc
 
+    def _build_batch(self, docs, **kwargs):
+        """
+        Builds a batch of source documents. The default builds each document on its own, subclasses can override it
+        to share the work (e.g. the database lookups) across the whole batch
+        :param docs:
+        :return: An iterator over the results of the documents in the batch
+        """
+        for doc in docs:
+            try:
+                yield self._build(doc, **kwargs)
+            except:
+                traceback.print_exc()
+
     @staticmethod
     def _get_id(string):
         return hashlib.sha1(string.encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _get_range_query(limit):
+        return {"id": {"$gte": limit[0], "$lte": limit[1]}}
+
     def _get_source_iterator(self, limit, mask):
-        return self._source.find({"id": {"$gte": limit[0], "$lte": limit[1]}}, mask)
+        return self._source.find(self._get_range_query(limit), mask)
+
+    def _get_source_batches(self, limit, mask):
+        """
+        Groups the documents returned by the source iterator in lists of batch_size documents
+        :param limit:
+        :param mask:
+        :return:
+        """
+        batch = []
+        for doc in self._get_source_iterator(limit, mask):
+            batch.append(doc)
+            if len(batch) >= self._batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
 
@@ -0,0 +1,54 @@
+import traceback
+from functools import partial
+from typing import List
+
+import nltk
+
+from builders.builder import Builder
+from utils.sentence_store import SentenceStore
+
+
+class SegmentedBuilder(Builder):
+    """
+    A builder of the articles split in sentences, segmenting the articles of a whole batch with the sentence store
+    """
+
+    def __init__(self, ip, port, db, source, destination, language, sentence_collection=None):
+        """
+        :param language: The language of the sentence segmenter
+        :param sentence_collection: The sidecar collection of the sentence boundaries, the articles are always
+        segmented when None
+        """
+        super().__init__(ip, port, db, source, destination)
+        self._sentence_store = SentenceStore(partial(nltk.sent_tokenize, language=language), language, self._get_id,
+                                             self._db[sentence_collection] if sentence_collection else None)
+
+    def _stats_components(self) -> List:
+        return super()._stats_components() + [self._sentence_store]
+
+    def _build_batch(self, docs, **kwargs):
+        """
+        Splits the articles of the whole batch in sentences with the sentence store, then builds each document
+        :param docs:
+        :return:
+        """
+        batch_sentences = self._sentence_store.split_batch([self._segmentation_text(doc) for doc in docs])
+        for doc, sentences in zip(docs, batch_sentences):
+            try:
+                yield self._build(doc, sentences=sentences, **kwargs)
+            except:
+                traceback.print_exc()
+
+    def _sentences(self, doc, **kwargs) -> List[str]:
+        """
+        :param doc:
+        :param kwargs: The arguments of _build, with the sentences of the article when built in a batch
+        :return: The sentences of the article
+        """
+        if 'sentences' in kwargs:
+            return kwargs['sentences']
+        return self._sentence_store.split(self._segmentation_text(doc))
+
+    @staticmethod
+    def _segmentation_text(doc):
+        return doc['text'].strip().replace("\n\n", "\n")
@@ -0,0 +1,47 @@
+import time
+
+_builder = None
+_setup_time = 0
+
+
+def init_worker(builder_class, *args, **kwargs):
+    """
+    Pool initializer, creates the builder of the worker process once so that its connections and models are reused
+    by all the chunks processed by the worker
+    :param builder_class:
+    :param args: The arguments of the builder
+    :param kwargs:
+    :return:
+    """
+    global _builder, _setup_time
+    start_time = time.time()
+    _builder = builder_class(*args, **kwargs)
+    _setup_time = int(time.time() - start_time)
+
+
+def build_chunk(limit, **kwargs):
+    """
+    Builds a chunk with the builder of the worker process. The setup time is reported only with the first chunk of
+    the worker
+    :param limit:
+    :param kwargs: The arguments of Builder.build
+    :return:
+    """
+    global _setup_time
+    res = _builder.build(limit, **kwargs)
+    res['chunk'] = limit
+    res['setup_elapsed'] = _setup_time
+    _setup_time = 0
+    return res
+
+
+def build_planned_chunk(task, **kwargs):
+    """
+    Builds a chunk dispatched by CheckpointLedger.dispatch, replacing the documents of its range only when a previous
+    run started it without completing it
+    :param task: The chunk and whether it was interrupted
+    :param kwargs: The arguments of Builder.build
+    :return:
+    """
+    limit, interrupted = task
+    return build_chunk(limit, replace=interrupted, **kwargs)
@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+import traceback
+
+import bson
+from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError
+
+_STOP = None
+
+
+class BulkWriter(object):
+    """
+    Writes the documents to a collection from a background thread, so that the building of the next documents
+    overlaps with the inserts. The documents are grouped in batches, and the batches wait in a bounded queue
+    """
+
+    def __init__(self, collection, batch_size=500, batch_bytes=None, queue_size=4, write_concern=None):
+        """
+        :param collection:
+        :param batch_size: Maximum number of documents of a batch
+        :param batch_bytes: Maximum size of the BSON documents of a batch, not checked when None
+        :param queue_size: Maximum number of batches waiting to be written
+        :param write_concern: Dict with the options of the pymongo WriteConcern, the collection's one when None
+        """
+        if write_concern:
+            collection = collection.with_options(write_concern=WriteConcern(**write_concern))
+        self._collection = collection
+        self._batch_size = batch_size
+        self._batch_bytes = batch_bytes
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._batch = []
+        self._bytes = 0
+
+        self._queued = 0
+        self._batches = 0
+        self._written = 0
+        self._flushes = 0
+        self._flush_time = 0.0
+        self._max_flush_time = 0.0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def start(self):
+        self._thread.start()
+
+    def write(self, document):
+        self._batch.append(document)
+        self._queued += 1
+        if self._batch_bytes:
+            self._bytes += len(bson.encode(document))
+        if len(self._batch) >= self._batch_size or (self._batch_bytes and self._bytes >= self._batch_bytes):
+            self._enqueue()
+
+    def close(self):
+        """
+        Writes the pending documents and waits for the background thread to complete
+        :return:
+        """
+        if self._batch:
+            self._enqueue()
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _enqueue(self):
+        depth = self._queue.qsize()
+        self._batches += 1
+        self._queue_depth += depth
+        self._max_queue_depth = max(self._max_queue_depth, depth)
+        self._queue.put(self._batch)
+        self._batch = []
+        self._bytes = 0
+
+    def _run(self):
+        while True:
+            batch = self._queue.get()
+            if batch is _STOP:
+                return
+            start_time = time.time()
+            try:
+                result = self._collection.insert_many(batch, ordered=False, bypass_document_validation=True)
+                self._written += len(result.inserted_ids)
+            except BulkWriteError as e:
+                self._written += e.details.get('nInserted', 0)
+                traceback.print_exc()
+            except:
+                traceback.print_exc()
+            flush_time = time.time() - start_time
+            self._flushes += 1
+            self._flush_time += flush_time
+            self._max_flush_time = max(self._max_flush_time, flush_time)
+
+    def stats(self):
+        return {"queued": self._queued, "written": self._written, "flushes": self._flushes,
+                "avg_flush_time": round(self._flush_time / max(self._flushes, 1), 3),
+                "max_flush_time": round(self._max_flush_time, 3),
+                "avg_queue_depth": round(self._queue_depth / max(self._batches, 1), 2),
+                "max_queue_depth": self._max_queue_depth}
@@ -1,12 +1,18 @@
-from utils.date_formatter import DateFormatterFactory
-from tokenizers.spacy_tokenizer import SpacyTokenizer
+from functools import lru_cache
 
 LANG = 'ca'
 LANGUAGE = 'catalan'
 LOCALE = 'ca'
 
+# The chunks of the qa and srl drivers are planned with these on the first run, the plan is kept in the checkpoint
+# until it is deleted
 NUM_WORKERS = 5
 CHUNK_SIZE = 1000
+MIN_CHUNK_SIZE = 50
+
+# The QA builder creates every negative example when None, as the baseline did, or samples at most this many for
+# each property of a document
+MAX_NEGATIVES_PER_PROPERTY = None
 
 MONGO_IP = "localhost"
 MONGO_PORT = 27017
@@ -17,7 +23,35 @@ WIKIMERGE_COLLECTION = "{}wiki_merged".format(LANG)
 
 QA_COLLECTION = "{}wiki_omer".format(LANG)
 SRL_COLLECTION = "{}wiki_srl".format(LANG)
+SENTENCES_COLLECTION = "{}wiki_sentences".format(LANG)
+
+CHAR_VOCAB_OUT = "{}_char.vocab".format(LANG)
+DOCUMENT_VOCAB_PATH = "{}_document.vocab".format(LANG)
+TYPE_VOCAB_PATH = "{}_type.vocab".format(LANG)
+ANSWER_VOCAB_PATH = "{}_answer.vocab".format(LANG)
+
+QA_CHECKPOINT = "{}wiki_qa_checkpoint.db".format(LANG)
+SRL_CHECKPOINT = "{}wiki_srl_checkpoint.db".format(LANG)
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer():
+    from tokenizers.spacy_tokenizer import SpacyTokenizer
+    return SpacyTokenizer(LANG, disable=['parser', 'ner', 'textcat', 'tagger'])
+
+
+@lru_cache(maxsize=None)
+def get_date_formatter():
+    from utils.date_formatter import DateFormatterFactory
+    return DateFormatterFactory.get_formatter(lang=LANG, out_locale=LOCALE)
+
+
+_LAZY_ATTRIBUTES = {'TOKENIZER': get_tokenizer, 'DATE_FORMATTER': get_date_formatter}
+
 
-TOKENIZER = SpacyTokenizer(LANG, disable=['parser', 'ner', 'textcat', 'tagger'])
-DATE_FORMATTER = DateFormatterFactory.get_formatter(lang=LANG, out_locale=LOCALE)
+def __getattr__(name):
+    # TOKENIZER and DATE_FORMATTER are built on first access, so importing config stays cheap
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
@@ -8,28 +8,34 @@ from pymongo import MongoClient
 
 import config
 from builders.QA import QABuilder, extract_examples
-from utils import get_chunks
-
-
-def qa(limit):
-    builder = QABuilder(config.MONGO_IP, config.MONGO_PORT, config.DB, config.WIKIMERGE_COLLECTION,
-                        config.SRL_COLLECTION, config.LANGUAGE)
-    return builder.build(limit)
+from builders.worker import build_planned_chunk, init_worker
+from utils.checkpoint import CheckpointLedger
+from utils.scheduler import cost_expression, plan_chunks
 
 
 def run_qa():
     client = MongoClient(config.MONGO_IP, config.MONGO_PORT)
     db = client[config.DB]
-    wikipedia = db[config.WIKIPEDIA_COLLECTION]
-    wikidocs = list(wikipedia.find({}, {'wikidata_id': 1, '_id': 0}).sort('wikidata_id'))
-    chunks = get_chunks(wikidocs, config.CHUNK_SIZE, 'wikidata_id')
-    del wikidocs
+    wikipedia = db[config.WIKIMERGE_COLLECTION]
+    # The chunks are read from the source, and replaced in the destination, by id range
+    wikipedia.create_index("id")
+    db[config.QA_COLLECTION].create_index("id")
+    ledger = CheckpointLedger(config.QA_CHECKPOINT)
+    chunks = plan_chunks(wikipedia, 'id', cost_expression(), ledger, config.NUM_WORKERS, config.MIN_CHUNK_SIZE,
+                         config.CHUNK_SIZE)
+    logging.info("Skipping {} completed chunks".format(len(ledger.done_chunks())))
     start_time = time.time()
     total = 0
-
-    pool = multiprocessing.Pool(config.NUM_WORKERS)
-    for res in pool.imap(qa, chunks):
+    total_setup = 0
+
+    builder_args = (QABuilder, config.MONGO_IP, config.MONGO_PORT, config.DB, config.WIKIMERGE_COLLECTION,
+                    config.QA_COLLECTION, config.LANGUAGE, config.SENTENCES_COLLECTION,
+                    config.MAX_NEGATIVES_PER_PROPERTY)
+    pool = multiprocessing.Pool(config.NUM_WORKERS, initializer=init_worker, initargs=builder_args)
+    for res in pool.imap_unordered(build_planned_chunk, ledger.dispatch(chunks)):
+        ledger.mark_done(res.pop('chunk'), res)
         total += res['processed']
+        total_setup += res['setup_elapsed']
         res['total'] = total
         part = int(time.time() - start_time)
         res['elapsed'] = compress(res['elapsed'])
@@ -38,9 +44,12 @@ def run_qa():
                      "total_elapsed})".format(**res))
 
     pool.terminate()
+    ledger.close()
+    client.close()
 
     elapsed = int(time.time() - start_time)
-    logging.info("Processed {} documents in {}".format(total, compress(elapsed)))
+    logging.info("Processed {} documents in {} (setup time {})".format(total, compress(elapsed),
+                                                                      compress(total_setup)))
     return
 
 
@@ -48,6 +57,5 @@ if __name__ == '__main__':
     logging.basicConfig(format='%(asctime)s - %(module)s - %(levelname)s - %(message)s', level=logging.INFO)
     logging.info("Running %s", " ".join(sys.argv))
     run_qa()
-    extract_examples("positive")
-    extract_examples("negative")
+    extract_examples(["positive", "negative"])
     logging.info("Completed %s", " ".join(sys.argv))
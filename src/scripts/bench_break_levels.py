@@ -0,0 +1,100 @@
+import argparse
+import itertools
+import json
+import random
+import re
+import time
+
+from tokenizers.TokenizerI import TokenizerI
+from tokenizers.utils import align_tokens
+
+TOKEN_RE = re.compile("\\w+|[^\\w\\s]")
+
+
+class RegexTokenizer(TokenizerI):
+    """
+    Library free stand-in for the tokenizers, so the break levels can be compared on the same tokens
+    """
+
+    def tokenize(self, text):
+        tokens = TOKEN_RE.findall(text)
+        return tokens, self._get_break_levels(text, tokens, align_tokens(tokens, text)), None
+
+
+def get_break_levels(tokenizer, text, tokens):
+    # The implementation previously in PolyglotTokenizer, on the strings between the token offsets
+    spans = list(sum(align_tokens(tokens, text), ()))
+    tokens = [text[b: e] for b, e in zip(spans, spans[1:])]
+    token_separators = [0]
+    for prev, curr, next in zip(tokens, tokens[1:], tokens[2:]):
+        if not curr:
+            continue
+        if curr in tokenizer.BREAK_LEVEL_TOKENS:
+            token_separators.append(tokenizer.BREAK_LEVEL_TOKENS[curr])
+            continue
+        if curr in tokenizer.SENTENCE_BREAKS:
+            separator = 1 if prev == ' ' else 0
+            token_separators.append(separator)
+            if next not in tokenizer.BREAK_LEVEL_TOKENS:
+                token_separators.append(tokenizer.BREAK_LEVEL_TOKENS['SENTENCE_BREAK'])
+            continue
+        if prev not in tokenizer.SENTENCE_BREAKS \
+                and prev not in tokenizer.BREAK_LEVEL_TOKENS \
+                and curr not in tokenizer.SENTENCE_BREAKS:
+            separator = 1 if prev == ' ' else 0
+            token_separators.append(separator)
+
+    return token_separators
+
+
+def load_articles(path, limit):
+    """
+    Reads the text of the articles of a JSON lines dump
+    :param path:
+    :param limit:
+    :return:
+    """
+    with open(path, "rt", encoding="utf8") as inf:
+        return [json.loads(line)['text'] for line in itertools.islice(inf, limit)]
+
+
+def synthetic_articles(limit, seed=0):
+    rnd = random.Random(seed)
+    vocab = ["w{}".format(i) for i in range(5000)]
+    articles = []
+    for _ in range(limit):
+        paragraphs = []
+        for _ in range(rnd.randint(5, 20)):
+            sentences = [" ".join(rnd.choice(vocab) for _ in range(rnd.randint(5, 30))) + rnd.choice(".!?")
+                         for _ in range(rnd.randint(1, 10))]
+            paragraphs.append(rnd.choice([" ", "\n"]).join(sentences))
+        articles.append("\n\n".join(paragraphs))
+    return articles
+
+
+def bench(articles):
+    tokenizer = RegexTokenizer()
+    tokenized = [(article, TOKEN_RE.findall(article)) for article in articles]
+
+    start_time = time.time()
+    old = [get_break_levels(tokenizer, article, tokens) for article, tokens in tokenized]
+    old_time = time.time() - start_time
+
+    start_time = time.time()
+    new = [tokenizer._get_break_levels(article, tokens, align_tokens(tokens, article)) for article, tokens in tokenized]
+    new_time = time.time() - start_time
+
+    assert all(len(levels) == len(tokens) for levels, (_, tokens) in zip(new, tokenized))
+    mismatched = sum(len(levels) != len(tokens) for levels, (_, tokens) in zip(old, tokenized))
+    print("articles={} old={:.3f}s new={:.3f}s speedup={:.1f}x old_length_mismatches={}".format(
+        len(articles), old_time, new_time, old_time / new_time, mismatched))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compares the break level computations.")
+    parser.add_argument('-i', '--input', help='JSON lines file of articles with a text field, synthetic when missing')
+    parser.add_argument('-n', '--limit', help='Number of articles', type=int, default=200)
+
+    args = parser.parse_args()
+
+    bench(load_articles(args.input, args.limit) if args.input else synthetic_articles(args.limit))
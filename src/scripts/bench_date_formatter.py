@@ -0,0 +1,80 @@
+import argparse
+import itertools
+import json
+import random
+import time
+
+from dateutil.parser import parse
+
+from utils import date_formatter
+from utils.date_formatter import DateFormatterFactory, parse_time
+
+
+def dateutil_parse_time(date):
+    # The parsing previously used for the days
+    parsed = parse(date)
+    return parsed.year, parsed.month, parsed.day
+
+
+def load_time_claims(path, limit):
+    """
+    Reads the time values of the claims of a Wikidata JSON lines dump
+    :param path:
+    :param limit: Number of entities
+    :return: The list of (time, precision) pairs
+    """
+    values = []
+    with open(path, "rt", encoding="utf8") as inf:
+        for line in itertools.islice(inf, limit):
+            entity = json.loads(line.rstrip(",\n"))
+            for claims in entity.get('claims', {}).values():
+                for claim in claims:
+                    datavalue = claim['mainsnak'].get('datavalue', {})
+                    if datavalue.get('type') == 'time':
+                        values.append((datavalue['value']['time'], datavalue['value']['precision']))
+    return values
+
+
+def synthetic_time_claims(limit, seed=0):
+    rnd = random.Random(seed)
+    values = []
+    for _ in range(limit):
+        year = int(rnd.triangular(1000, 2020, 1950))
+        precision = rnd.choice([9, 9, 10, 11, 11, 11, 7])
+        day = "{:02d}-{:02d}".format(rnd.randint(1, 12), rnd.randint(1, 28)) if precision == 11 else "01-01"
+        values.append(("+{:04d}-{}T00:00:00Z".format(year, day), precision))
+    return values
+
+
+def bench(values, langs):
+    for lang in langs:
+        formatter = DateFormatterFactory.get_formatter(lang, None)
+
+        # The previous formatting, without memoization and with dateutil
+        date_formatter.parse_time = dateutil_parse_time
+        start_time = time.time()
+        for date, precision in values:
+            try:
+                formatter._format(date, precision)
+            except (ValueError, KeyError, IndexError, OverflowError):
+                pass
+        old_time = time.time() - start_time
+        date_formatter.parse_time = parse_time
+
+        start_time = time.time()
+        formatter.format_batch(values)
+        new_time = time.time() - start_time
+
+        print("lang={} values={} distinct={} old={:.3f}s new={:.3f}s speedup={:.1f}x".format(
+            lang, len(values), len(set(values)), old_time, new_time, old_time / new_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compares the date formatting with and without memoization.")
+    parser.add_argument('-i', '--input', help='Wikidata JSON lines dump, synthetic time values when missing')
+    parser.add_argument('-n', '--limit', help='Number of entities, or of synthetic values', type=int, default=100000)
+    parser.add_argument('-l', '--langs', help='Languages', nargs='+', default=['en', 'it', 'es', 'de', 'fr', 'kn'])
+
+    args = parser.parse_args()
+
+    bench(load_time_claims(args.input, args.limit) if args.input else synthetic_time_claims(args.limit), args.langs)
@@ -0,0 +1,75 @@
+import argparse
+import itertools
+import json
+import random
+import time
+
+from utils.matcher import SubsequenceMatcher
+
+
+def find_full_matches(list, sublist):
+    # The implementation previously copied in WikiReadingBuilder, SRLBuilder and utils.utils
+    results = []
+    sll = len(sublist)
+    for ind in (i for i, e in enumerate(list) if e == sublist[0]):
+        if list[ind:ind + sll] == sublist:
+            results.append(range(ind, ind + sll))
+
+    return results
+
+
+def load_documents(path, limit):
+    """
+    Reads the string sequence and the answers of the documents of a WikiReading JSON lines file
+    :param path:
+    :param limit:
+    :return:
+    """
+    documents = []
+    with open(path, "rt", encoding="utf8") as inf:
+        for line in itertools.islice(inf, limit):
+            document = json.loads(line)
+            sequence = document['string_sequence']
+            answers = document['answer_string_sequence']
+            breaks = [0] + document.get('answer_breaks', []) + [len(answers)]
+            documents.append((sequence, [answers[b:e] for b, e in zip(breaks, breaks[1:]) if e > b]))
+    return documents
+
+
+def synthetic_documents(limit, seed=0):
+    rnd = random.Random(seed)
+    common = ["the", "of", "de", ",", ".", "and", "in"]
+    vocab = common * 20 + ["w{}".format(i) for i in range(5000)]
+    documents = []
+    for _ in range(limit):
+        sequence = [rnd.choice(vocab) for _ in range(3000)]
+        answers = [[rnd.choice(common)] + [rnd.choice(vocab) for _ in range(rnd.randint(0, 3))] for _ in range(30)]
+        documents.append((sequence, answers))
+    return documents
+
+
+def bench(documents):
+    start_time = time.time()
+    old = [[find_full_matches(sequence, answer) for answer in answers] for sequence, answers in documents]
+    old_time = time.time() - start_time
+
+    start_time = time.time()
+    new = []
+    for sequence, answers in documents:
+        locations = SubsequenceMatcher(answers).find_all(sequence)
+        new.append([locations[tuple(answer)] for answer in answers])
+    new_time = time.time() - start_time
+
+    assert old == new
+    print("documents={} old={:.3f}s new={:.3f}s speedup={:.1f}x".format(len(documents), old_time, new_time,
+                                                                         old_time / new_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compares the subsequence matchers.")
+    parser.add_argument('-i', '--input', help='WikiReading JSON lines file, synthetic documents when missing')
+    parser.add_argument('-n', '--limit', help='Number of documents', type=int, default=200)
+
+    args = parser.parse_args()
+
+    bench(load_documents(args.input, args.limit) if args.input else synthetic_documents(args.limit))
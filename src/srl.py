@@ -3,44 +3,48 @@ import logging
 import multiprocessing
 import sys
 import time
-from functools import partial
 
 from natural.date import compress
 from pymongo import MongoClient
 
 import config
 from builders.SRL import SRLBuilder
-from utils.utils import get_chunks
+from builders.worker import build_planned_chunk, init_worker
+from utils.checkpoint import CheckpointLedger
+from utils.scheduler import cost_expression, plan_chunks
 
 
 
-def build(limit, configs):
-    pass
-    builder = SRLBuilder(config.MONGO_IP, config.MONGO_PORT, config.DB, config.WIKIMERGE_COLLECTION,
-                         config.SRL_COLLECTION, config.LANG, config.LANGUAGE)
-
-    return builder.build(limit)
-
-
 def build_srl(configs):
     client = MongoClient(config.MONGO_IP, config.MONGO_PORT)
     db = client[config.DB]
     wikipedia = db[config.WIKIMERGE_COLLECTION]
-    documents_id = list(wikipedia.find({}, {"id": 1, "_id": 0}).sort("id"))
-    client.close()
+    # The chunks are read from the source, and replaced in the destination, by id range
+    wikipedia.create_index("id")
+    db[config.SRL_COLLECTION].create_index("id")
     start_time = time.time()
     total = 0
     total_extracted = 0
     total_skipped = 0
-    chunks = get_chunks(documents_id, config.CHUNK_SIZE, 'id')
+    ledger = CheckpointLedger(config.SRL_CHECKPOINT)
+    chunks = plan_chunks(wikipedia, 'id', cost_expression(), ledger, config.NUM_WORKERS, config.MIN_CHUNK_SIZE,
+                         config.CHUNK_SIZE)
+    logging.info("Skipping {} completed chunks".format(len(ledger.done_chunks())))
+    builder_args = (SRLBuilder, config.MONGO_IP, config.MONGO_PORT, config.DB, config.WIKIMERGE_COLLECTION,
+                    config.SRL_COLLECTION, config.LANG, config.LANGUAGE, config.SENTENCES_COLLECTION)
+    total_setup = 0
     if config.NUM_WORKERS == 1:
-        for chunk in chunks:
-            build(chunk, {})
+        init_worker(*builder_args)
+        for task in ledger.dispatch(chunks):
+            res = build_planned_chunk(task)
+            ledger.mark_done(res.pop('chunk'), res)
     else:
-        pool = multiprocessing.Pool(config.NUM_WORKERS)
+        pool = multiprocessing.Pool(config.NUM_WORKERS, initializer=init_worker, initargs=builder_args)
 
-        for res in pool.imap(partial(build, configs=configs), chunks):
+        for res in pool.imap_unordered(build_planned_chunk, ledger.dispatch(chunks)):
+            ledger.mark_done(res.pop('chunk'), res)
             total += res['processed']
+            total_setup += res['setup_elapsed']
             if 'extracted' in res:
                 total_extracted += res['extracted']
                 total_skipped += res['skipped']
@@ -53,8 +57,11 @@ def build_srl(configs):
                 logging.info(', '.join("{!s}={!r}".format(key, val) for key, val in res.items()))
 
         pool.terminate()
+    ledger.close()
+    client.close()
     elapsed = int(time.time() - start_time)
-    logging.info("Processed {} documents in {} - Total extracted {}".format(total, compress(elapsed), total_extracted))
+    logging.info("Processed {} documents in {} (setup time {}) - Total extracted {}".format(
+        total, compress(elapsed), compress(total_setup), total_extracted))
     return
 
 
@@ -0,0 +1,44 @@
+"""
+In-memory stand-ins of the MongoDB collections used by the builders in the tests
+"""
+
+
+class InsertResult(object):
+    def __init__(self, ids):
+        self.inserted_ids = ids
+
+
+class ListCollection(object):
+    """
+    A collection returning all its documents for any query but the $in queries on id
+    """
+
+    def __init__(self, docs=None):
+        self.docs = list(docs or [])
+
+    def find(self, query, mask=None):
+        ids = query.get("id", {}).get("$in") if isinstance(query.get("id"), dict) else None
+        return [dict(doc) for doc in self.docs if ids is None or doc.get("id") in ids]
+
+    def insert_many(self, docs, **kwargs):
+        self.docs.extend(docs)
+        return InsertResult(list(range(len(docs))))
+
+    def delete_many(self, query):
+        self.docs = []
+
+
+class DictCollection(object):
+    """
+    A collection of documents keyed by _id, answering the $in queries on _id
+    """
+
+    def __init__(self):
+        self.docs = {}
+
+    def find(self, query):
+        return [self.docs[key] for key in query["_id"]["$in"] if key in self.docs]
+
+    def insert_many(self, docs, ordered=True):
+        for doc in docs:
+            self.docs[doc["_id"]] = doc
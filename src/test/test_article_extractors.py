@@ -159,3 +159,19 @@ class TestSpanishArticleExtractor(unittest.TestCase):
         extractor = SpanishArticleExtractor()
         article = extractor.extract(text, entity)
         self.assertEqual(article.lower(), 'la')
+
+
+class TestLeadWindow(unittest.TestCase):
+    def test_lead(self):
+        text = "Girasoli è una serie di dipinti. " + "Van Gogh dipinse i suoi quadri. " * 50 + "I Girasoli sono noti."
+
+        self.assertEqual("I", ItalianArticleExtractor(lead_size=len(text)).extract(text, "Girasoli"))
+        self.assertEqual("", ItalianArticleExtractor(lead_size=100).extract(text, "Girasoli"))
+        self.assertEqual("I", ItalianArticleExtractor(lead_size=100).extract(text, "I Girasoli"))
+
+    def test_german_first_line(self):
+        text = "Hunde sind eine Familie.\nDie Hunde gehören zu den Hundeartigen."
+        self.assertEqual("", GermanArticleExtractor().extract(text, "Hunde"))
+        text = "Die Hunde sind eine Familie. " + "Zu den Hunden gehören die Füchse. " * 50
+        self.assertEqual("Die", GermanArticleExtractor(lead_size=100).extract(text, "Hunde"))
+        self.assertEqual("", GermanArticleExtractor(lead_size=3).extract(text, "Hunde"))
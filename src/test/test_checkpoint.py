@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+from utils.checkpoint import CheckpointLedger
+
+
+class TestCheckpointLedger(unittest.TestCase):
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "checkpoint.db")
+            ledger = CheckpointLedger(path)
+            ledger.mark_done(("Q1", "Q100"), {"processed": 10})
+            self.assertTrue(ledger.is_done(("Q1", "Q100")))
+            self.assertFalse(ledger.is_done(("Q101", "Q200")))
+            ledger.close()
+
+            ledger = CheckpointLedger(path)
+            self.assertEqual({("Q1", "Q100")}, ledger.done_chunks())
+            self.assertEqual({"processed": 10}, ledger.stats(("Q1", "Q100")))
+            ledger.mark_done(("Q1", "Q100"), {"processed": 12})
+            self.assertEqual({"processed": 12}, ledger.stats(("Q1", "Q100")))
+            ledger.close()
+
+    def test_plan(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "checkpoint.db")
+            ledger = CheckpointLedger(path)
+            self.assertIsNone(ledger.plan())
+            ledger.set_plan({"num_workers": 5, "total": 1000})
+            ledger.close()
+
+            ledger = CheckpointLedger(path)
+            self.assertEqual({"num_workers": 5, "total": 1000}, ledger.plan())
+            ledger.close()
+
+    def test_dispatch(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "checkpoint.db")
+            ledger = CheckpointLedger(path)
+            chunks = [("Q1", "Q100"), ("Q101", "Q200"), ("Q201", "Q300")]
+            tasks = ledger.dispatch(chunks)
+            self.assertEqual((("Q1", "Q100"), False), next(tasks))
+            self.assertEqual((("Q101", "Q200"), False), next(tasks))
+            ledger.mark_done(("Q1", "Q100"), {"processed": 10})
+            self.assertEqual({("Q1", "Q100")}, ledger.done_chunks())
+            self.assertFalse(ledger.is_done(("Q101", "Q200")))
+            ledger.close()
+
+            # Only the chunk started and not completed by the interrupted run has to be replaced
+            ledger = CheckpointLedger(path)
+            self.assertEqual({("Q101", "Q200")}, ledger.started_chunks())
+            self.assertListEqual([(("Q101", "Q200"), True), (("Q201", "Q300"), False)],
+                                 list(ledger.dispatch(chunks[1:])))
+            ledger.close()
@@ -1,6 +1,7 @@
 import unittest
 
-from utils.date_formatter import DateFormatter, RomanLanguageDateFormatter, EnglishDateFormatter
+from utils.date_formatter import DateFormatter, RomanLanguageDateFormatter, EnglishDateFormatter, \
+    KannadaDateFormatter, parse_time
 
 
 class TestFormatterMethods(unittest.TestCase):
@@ -221,13 +222,38 @@ class TestRomanFormatterMethods(unittest.TestCase):
         formatted = formatter.format(date, precision)
         self.assertEquals(formatted, "siglo IX a. C.")
 
-class TestKannadaDateFormatter(unittest):
+
+class TestKannadaDateFormatter(unittest.TestCase):
     def test_century(self):
-        formatter = KannadaDateFormatter(lang="fr", out_locale='fr-FR')
+        formatter = KannadaDateFormatter(lang="kn")
         precision = 7
 
         date = "+00000001900-01-01T00:00:00Z"
         formatted = formatter.format(date, precision)
 
+
+class TestMultipleLanguages(unittest.TestCase):
+    def test_interleaved(self):
+        formatters = [DateFormatter(lang='de', out_locale='de-DE'), RomanLanguageDateFormatter(lang='it'),
+                      RomanLanguageDateFormatter(lang='ca', out_locale='ca')]
+        date = "+00000001920-04-01T00:00:00Z"
+        self.assertListEqual(["1. April 1920", "1° aprile 1920", "1 d'abril de 1920"],
+                             [formatter.format(date, 11) for formatter in formatters])
+        self.assertListEqual(["April 1920", "aprile 1920", "abril de 1920"],
+                             [formatter.format(date, 10) for formatter in formatters])
+
+
+class TestBatchFormat(unittest.TestCase):
+    def test_parse_time(self):
+        self.assertEqual((1920, 1, 2), parse_time("00000001920-01-02T00:00:00Z"))
+        self.assertEqual((20, 1, 0), parse_time("000000020-01-00T00:00:00Z"))
+
+    def test_format_batch(self):
+        formatter = KannadaDateFormatter(lang="kn")
+        values = [("+00000001920-01-02T00:00:00Z", 11), ("+00000001920-13-02T00:00:00Z", 11),
+                  ("+00000001920-01-02T00:00:00Z", 11), ("-00000001920-00-00T00:00:00Z", 9)]
+        self.assertListEqual(["ಜನವರಿ ೨, ೧೯೨೦", None, "ಜನವರಿ ೨, ೧೯೨೦", "೧೯೨೦ ಕ್ರಿ.ಪೂ"], formatter.format_batch(values))
+
+
 if __name__ == '__main__':
     unittest.main()
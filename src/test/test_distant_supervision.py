@@ -0,0 +1,75 @@
+import random
+import re
+import unittest
+
+from utils.distant_supervision import MultiPatternMatcher, SentenceIndex, boundary_pattern, first_sentences
+
+
+def reference_first_sentence(answer, entity, sentences):
+    e_template = "\\b" + re.escape(entity) + "\\b"
+    a_template = "\\b" + re.escape(answer) + "\\b"
+    for sentence in sentences:
+        if re.search(e_template, sentence) and re.search(a_template, sentence):
+            return sentence
+
+    return False
+
+
+class TestMultiPatternMatcher(unittest.TestCase):
+    def test_overlapping(self):
+        matcher = MultiPatternMatcher(["Stati Uniti", "Stati Uniti d'America", "America", "Uniti d", "1961"])
+        found = matcher.find_all("Obama è nato negli Stati Uniti d'America nel 4 agosto 1961.")
+        self.assertEqual({"Stati Uniti", "Stati Uniti d'America", "America", "Uniti d", "1961"}, found)
+
+    def test_boundaries(self):
+        matcher = MultiPatternMatcher(["Uni", "a.C.", "20"])
+        self.assertEqual(set(), matcher.find_all("Gli Stati Uniti nel 2020 a.C. circa"))
+        self.assertEqual({"20"}, matcher.find_all("nel 20 a.C. circa"))
+
+    def test_offsets(self):
+        matcher = MultiPatternMatcher(["Stati Uniti", "America", "20"])
+        text = "Nel 2020 e nel 20 a.C. negli Stati Uniti d'America e negli Stati Uniti"
+        self.assertEqual({"Stati Uniti": text.index("Stati"), "America": text.index("America"),
+                          "20": text.index(" 20 ") + 1}, matcher.find_offsets(text))
+
+
+class TestFirstSentences(unittest.TestCase):
+    def test_first(self):
+        sentences = ["Barack Obama was born in 1961.", "Obama lived in Honolulu.",
+                     "Barack Obama was president of the United States.", "Barack Obama lived in Honolulu."]
+        res = first_sentences("Barack Obama", ["1961", "Honolulu", "United States", "Chicago"], sentences)
+        self.assertEqual({"1961": sentences[0], "Honolulu": sentences[3], "United States": sentences[2]}, res)
+        res = first_sentences("Barack Obama", ["1961", "Honolulu"], sentences, offsets=True)
+        self.assertEqual({"1961": (sentences[0], 25), "Honolulu": (sentences[3], 22)}, res)
+
+    def test_reference(self):
+        rnd = random.Random(0)
+        words = ["la", "casa", "di", "Roma", "1961", "de", "Stati", "Uniti", "(", ")", "a.C.", "-", "l'"]
+        sentences = [" ".join(rnd.choice(words) for _ in range(12)) for _ in range(50)]
+        answers = {" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 3))) for _ in range(100)}
+        entity = "Roma"
+        res = first_sentences(entity, answers, sentences)
+        for answer in answers:
+            self.assertEqual(reference_first_sentence(answer, entity, sentences), res.get(answer, False), answer)
+
+
+class TestSentenceIndex(unittest.TestCase):
+    def test_candidates(self):
+        sentences = ["Obama was born in Honolulu.", "He studied at Columbia University.", "Obama was born in 1961."]
+        index = SentenceIndex(sentences)
+        self.assertEqual({0, 2}, index.candidates("Obama was born"))
+        self.assertEqual({1}, index.candidates("Columbia University"))
+        self.assertEqual(set(), index.candidates("Harvard University"))
+        self.assertEqual({0, 1, 2}, index.candidates("-"))
+        self.assertEqual({0, 1}, index.candidates_any(["Honolulu", "Columbia"]))
+
+    def test_reference(self):
+        rnd = random.Random(1)
+        words = ["la", "casa", "di", "Roma", "1961", "de", "Stati", "Uniti", "(", ")", "a.C.", "-", "l'"]
+        sentences = [" ".join(rnd.choice(words) for _ in range(12)) for _ in range(50)]
+        strings = {" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 3))) for _ in range(100)}
+        index = SentenceIndex(sentences)
+        for string in strings:
+            pattern = re.compile(boundary_pattern(string))
+            expected = {i for i, sentence in enumerate(sentences) if pattern.search(sentence)}
+            self.assertEqual(expected, index.search(pattern, index.candidates(string)), string)
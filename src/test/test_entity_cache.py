@@ -0,0 +1,43 @@
+import os
+import tempfile
+import unittest
+
+from utils.entity_cache import EntityCache
+
+
+class TestEntityCache(unittest.TestCase):
+    def test_lru(self):
+        cache = EntityCache(max_size=2)
+        cache.update({"Q1": {"id": "Q1", "label": "a"}, "Q2": {"id": "Q2", "label": "b"}})
+        found, missing = cache.get_many(["Q1", "Q3"])
+        self.assertEqual({"Q1"}, set(found))
+        self.assertEqual(["Q3"], missing)
+
+        cache.update({"Q3": {"id": "Q3", "label": "c"}})
+        found, missing = cache.get_many(["Q1", "Q2", "Q3"])
+        self.assertEqual({"Q1", "Q3"}, set(found))
+        self.assertEqual(["Q2"], missing)
+
+        stats = cache.stats()
+        self.assertEqual(3, stats['cache_hits'])
+        self.assertEqual(2, stats['cache_misses'])
+        self.assertEqual(2, stats['cache_size'])
+
+        cache.reset_stats()
+        cache.get_many(["Q1"])
+        stats = cache.stats()
+        self.assertEqual((1, 0, 2), (stats['cache_hits'], stats['cache_misses'], stats['cache_size']))
+
+    def test_store(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "entities.db")
+            writer = EntityCache(max_size=10, path=path)
+            writer.update({"Q5": {"id": "Q5", "label": "human", "aliases": []}})
+
+            reader = EntityCache(max_size=10, path=path)
+            found, missing = reader.get_many(["Q5", "Q30"])
+            self.assertEqual({"id": "Q5", "label": "human", "aliases": []}, found["Q5"])
+            self.assertEqual(["Q30"], missing)
+            self.assertEqual(1, reader.stats()['cache_store_hits'])
+            writer.close()
+            reader.close()
@@ -0,0 +1,41 @@
+import json
+import os
+import tempfile
+import unittest
+
+from utils.label_index import LabelIndex, build_label_index, iter_dump
+
+ENTITIES = [
+    {"id": "Q30", "labels": {"en": {"value": "United States of America"}},
+     "aliases": {"en": [{"value": "USA"}, {"value": "US"}]}},
+    {"id": "Q5", "labels": {"en": {"value": "human"}, "it": {"value": "essere umano"}}, "aliases": []},
+    {"id": "P27", "labels": {"en": {"value": "country of citizenship"}}, "aliases": {"en": [{"value": "citizen of"}]}},
+    {"id": "Q42", "labels": {"it": {"value": "Douglas Adams"}}, "aliases": {}},
+    # Wikibase writes the empty maps as lists
+    {"id": "Q6", "labels": [], "aliases": []},
+]
+
+
+class TestLabelIndex(unittest.TestCase):
+    def test_lookup(self):
+        with tempfile.TemporaryDirectory() as folder:
+            self.assertEqual(3, build_label_index(ENTITIES, "en", folder))
+            index = LabelIndex(folder)
+            self.assertEqual(("United States of America", ["USA", "US"]), index.get("Q30"))
+            self.assertEqual(("human", []), index.get("Q5"))
+            self.assertEqual({"id": "P27", "label": "country of citizenship", "aliases": ["citizen of"]},
+                             index.get_document("P27"))
+            self.assertIsNone(index.get("Q42"))
+            self.assertIsNone(index.get("Q1000000"))
+            self.assertNotIn("P31", index)
+            found, missing = index.get_documents(["Q5", "Q6"])
+            self.assertEqual(["Q5"], list(found))
+            self.assertEqual(["Q6"], missing)
+            index.close()
+
+    def test_dump(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "dump.json")
+            with open(path, "wt", encoding="utf8") as outf:
+                outf.write("[\n" + ",\n".join(json.dumps(entity) for entity in ENTITIES) + "\n]\n")
+            self.assertEqual(ENTITIES, list(iter_dump(path)))
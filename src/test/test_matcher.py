@@ -0,0 +1,41 @@
+import random
+import unittest
+
+from utils.matcher import SubsequenceMatcher, find_full_matches
+
+
+def reference_find_full_matches(sequence, sublist):
+    results = []
+    sll = len(sublist)
+    for ind in (i for i, e in enumerate(sequence) if e == sublist[0]):
+        if sequence[ind:ind + sll] == sublist:
+            results.append(range(ind, ind + sll))
+
+    return results
+
+
+class TestSubsequenceMatcher(unittest.TestCase):
+    def test_single(self):
+        sequence = ["the", "United", "States", "of", "the", "United", "Kingdom"]
+        self.assertListEqual([range(0, 2), range(4, 6)], find_full_matches(sequence, ["the", "United"]))
+        self.assertListEqual([[1, 2]], find_full_matches(sequence, ["United", "States"], as_list=True))
+        self.assertListEqual([], find_full_matches(sequence, ["Kingdom", "of"]))
+        self.assertListEqual([], find_full_matches(sequence, []))
+
+    def test_overlapping(self):
+        sequence = ["a", "a", "a", "b", "a", "a"]
+        matcher = SubsequenceMatcher([["a", "a"], ["a", "a", "b"], ["a", "b", "a"], ["b"]])
+        res = matcher.find_all(sequence)
+        self.assertListEqual([range(0, 2), range(1, 3), range(4, 6)], res[("a", "a")])
+        self.assertListEqual([range(1, 4)], res[("a", "a", "b")])
+        self.assertListEqual([range(2, 5)], res[("a", "b", "a")])
+        self.assertListEqual([range(3, 4)], res[("b",)])
+
+    def test_reference(self):
+        rnd = random.Random(0)
+        tokens = ["the", "de", "of", "United", "States", ",", "."]
+        sequence = [rnd.choice(tokens) for _ in range(2000)]
+        patterns = [[rnd.choice(tokens) for _ in range(rnd.randint(1, 4))] for _ in range(50)]
+        res = SubsequenceMatcher(patterns).find_all(sequence)
+        for pattern in patterns:
+            self.assertListEqual(reference_find_full_matches(sequence, pattern), res[tuple(pattern)])
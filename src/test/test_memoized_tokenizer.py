@@ -0,0 +1,54 @@
+import unittest
+
+from tokenizers.memoized_tokenizer import MemoizedTokenizer
+
+
+class CountingTokenizer(object):
+    def __init__(self):
+        self.calls = 0
+
+    def tokenize(self, text):
+        self.calls += 1
+        tokens = text.split()
+        return tokens, [0] + [1] * (len(tokens) - 1), tokens
+
+
+class TestMemoizedTokenizer(unittest.TestCase):
+    def test_memoized(self):
+        tokenizer = CountingTokenizer()
+        memoized = MemoizedTokenizer(tokenizer.tokenize, max_size=2, max_length=30)
+        self.assertEqual((["United", "States"], [0, 1], ["United", "States"]), memoized.tokenize("United States"))
+        tokens, _, _ = memoized.tokenize("United States")
+        tokens.append("!")
+        self.assertEqual(["United", "States"], memoized.tokenize("United States")[0])
+        self.assertEqual(1, tokenizer.calls)
+        self.assertEqual({"tokenizer_hits": 2, "tokenizer_misses": 1, "tokenizer_hit_rate": 0.6667}, memoized.stats())
+
+        memoized.reset_stats()
+        memoized.tokenize("United States")
+        self.assertEqual({"tokenizer_hits": 1, "tokenizer_misses": 0, "tokenizer_hit_rate": 1.0}, memoized.stats())
+
+    def test_bounded(self):
+        tokenizer = CountingTokenizer()
+        memoized = MemoizedTokenizer(tokenizer.tokenize, max_size=2, max_length=10)
+        for text in ["a", "b", "c", "a", "a long sentence not memoized", "a long sentence not memoized"]:
+            memoized.tokenize(text)
+        self.assertEqual(6, tokenizer.calls)
+
+    def test_batch(self):
+        tokenizer = CountingTokenizer()
+        memoized = MemoizedTokenizer(tokenizer.tokenize)
+        memoized.tokenize("human")
+        texts = ["human", "country of citizenship", "human"]
+        self.assertListEqual([tokenizer.tokenize(text) for text in texts], memoized.tokenize_batch(texts))
+
+    def test_batch_duplicates(self):
+        tokenizer = CountingTokenizer()
+        memoized = MemoizedTokenizer(tokenizer.tokenize, max_length=10)
+        texts = ["human", "a sentence longer than ten", "human", "a sentence longer than ten", "human"]
+        results = memoized.tokenize_batch(texts)
+        self.assertEqual(2, tokenizer.calls)
+        self.assertListEqual([tokenizer.tokenize(text) for text in texts], results)
+        results[0][0].append("!")
+        self.assertListEqual(["human"], results[2][0])
+        self.assertEqual({"tokenizer_hits": 2, "tokenizer_misses": 1, "tokenizer_hit_rate": 0.6667}, memoized.stats())
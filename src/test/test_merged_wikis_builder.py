@@ -0,0 +1,58 @@
+import unittest
+
+from builders.MergedWikis import MergedWikisBuilder
+from test.fakes import ListCollection
+
+
+def entity(id, label, claims=None, aliases=None):
+    doc = {"id": id, "labels": {"en": {"language": "en", "value": label}},
+           "aliases": {} if aliases is None else aliases}
+    if claims is not None:
+        doc["claims"] = claims
+    return doc
+
+
+def entity_claim(id):
+    return {"mainsnak": {"datatype": "wikibase-item",
+                         "datavalue": {"type": "wikibase-entityid", "value": {"id": id}}}}
+
+
+class TestMergedWikisBuilder(unittest.TestCase):
+    def setUp(self):
+        self.builder = MergedWikisBuilder("localhost", 27017, "test", "wikipedia", "wikidata", "destination", "en",
+                                          "en")
+        self.builder._wikidata = ListCollection([entity("Q76", "Barack Obama", {"P19": [entity_claim("Q18094")]}),
+                                                 entity("Q1", "Universe", []), entity("Q2", "Earth"),
+                                                 entity("P19", "place of birth"), entity("Q18094", "Honolulu")])
+        self.builder._destination = ListCollection()
+
+    def build(self, ids):
+        self.builder._source = ListCollection([{"id": id, "wikidata_id": id, "text": "Text of {}.".format(id)}
+                                               for id in ids])
+        return self.builder.build(("Q1", "Q99"))
+
+    def test_build_batch(self):
+        with self.assertLogs(level="WARNING"):
+            res = self.build(["Q1", "Q76", "Q2"])
+        # The entities with claims that are not a dict are skipped, not the batch
+        self.assertEqual(1, res['processed'])
+        document = self.builder._destination.docs[0]
+        self.assertEqual("Barack Obama", document['label'])
+        self.assertEqual({"P19": {"id": "P19", "label": "place of birth", "aliases": []}}, document['properties'])
+        self.assertEqual(["Honolulu"], [fact['value'] for fact in document['facts']['P19']])
+
+    def test_empty_maps(self):
+        # Wikibase writes the empty maps as lists
+        self.builder._wikidata.docs[3:] = [entity("P19", "place of birth", aliases=[]),
+                                           entity("Q18094", "Honolulu", aliases=[])]
+        self.builder._wikidata.docs.append({"id": "Q5", "labels": [], "aliases": []})
+        self.builder._wikidata.docs[0]["claims"]["P31"] = [entity_claim("Q5")]
+        self.build(["Q76"])
+        document = self.builder._destination.docs[0]
+        self.assertEqual({"id": "P19", "label": "place of birth", "aliases": []}, document['properties']['P19'])
+        self.assertEqual(["Honolulu"], [fact['value'] for fact in document['facts']['P19']])
+        self.assertNotIn("P31", document['facts'])
+
+
+if __name__ == '__main__':
+    unittest.main()
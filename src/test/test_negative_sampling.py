@@ -0,0 +1,50 @@
+import itertools
+import random
+import re
+import unittest
+
+from utils.negative_sampling import answers_in_sentences, negative_pairs
+
+
+def reference_pairs(examples):
+    # The combinations of the examples previously enumerated by QABuilder
+    pairs = []
+    for (i, a), (j, b) in itertools.combinations(enumerate(examples), 2):
+        if a['prop_id'] != b['prop_id'] and not re.search("\\b" + re.escape(a['answer']) + "\\b", b['sentence']):
+            pairs.append((i, j))
+    return pairs
+
+
+def random_examples(size, seed=0):
+    rnd = random.Random(seed)
+    answers = ["1961", "1962", "4 agosto 1961", "2020", "12"]
+    examples = []
+    for i in range(size):
+        sentence = "Nato il {} e morto il {}.".format(rnd.choice(answers), rnd.choice(answers))
+        examples.append({"prop_id": rnd.choice(["P569", "P570", "P571"]), "answer": rnd.choice(answers),
+                         "sentence": sentence, "id": str(i)})
+    return examples
+
+
+class TestNegativePairs(unittest.TestCase):
+    def test_all(self):
+        examples = random_examples(60)
+        pairs = negative_pairs(examples, answers_in_sentences(examples))
+        self.assertEqual(sorted(reference_pairs(examples)), sorted(pairs))
+
+    def test_sampled(self):
+        examples = random_examples(300)
+        reference = set(reference_pairs(examples))
+        pairs = list(negative_pairs(examples, answers_in_sentences(examples), max_per_property=20, seed="0"))
+        self.assertEqual(len(pairs), len(set(pairs)))
+        self.assertTrue(set(pairs) <= reference)
+        for prop in ["P569", "P570", "P571"]:
+            count = len([i for i, _ in pairs if examples[i]['prop_id'] == prop])
+            self.assertGreater(count, 0)
+            self.assertLessEqual(count, 20)
+        self.assertListEqual(pairs, list(negative_pairs(examples, answers_in_sentences(examples), 20, "0")))
+
+    def test_under_cap(self):
+        examples = random_examples(10)
+        pairs = negative_pairs(examples, answers_in_sentences(examples), max_per_property=1000, seed="0")
+        self.assertEqual(sorted(reference_pairs(examples)), sorted(pairs))
@@ -0,0 +1,43 @@
+import unittest
+
+from builders.QA import QABuilder
+from test.fakes import DictCollection, ListCollection
+
+
+class TestQABuilder(unittest.TestCase):
+    def setUp(self):
+        self.builder = QABuilder("localhost", 27017, "test", "source", "destination", "en")
+
+    def test_build_stats(self):
+        # One builder is reused for all the chunks of a worker, the stats are the ones of each chunk
+        builder = QABuilder("localhost", 27017, "test", "source", "destination", "en", "sentences")
+        builder._source = ListCollection([{"id": "Q76", "label": "Barack Obama",
+                                           "text": "Barack Obama was born in Honolulu.",
+                                           "properties": {"P19": {"label": "place of birth"}},
+                                           "facts": {"P19": [{"value": "Honolulu", "id": "Q18094", "type": "city"}]}}])
+        builder._destination = ListCollection()
+        builder._sentence_store._collection = DictCollection()
+        builder._sentence_store._segmenter = lambda text: [text]
+
+        res = builder.build(("Q1", "Q9"))
+        self.assertEqual((1, 1, 0), (res['pos_count'], res['sentence_store_misses'], res['sentence_store_hits']))
+        res = builder.build(("Q1", "Q9"))
+        self.assertEqual((1, 0, 1), (res['pos_count'], res['sentence_store_misses'], res['sentence_store_hits']))
+
+    def example(self, id, prop_id, answer, sentence):
+        return {"id": id, "prop_id": prop_id, "relation": prop_id, "answer": answer, "sentence": sentence,
+                "type": "human"}
+
+    def test_create_negatives(self):
+        qas = {"human": [self.example("Q1", "P19", "Honolulu", "Obama was born in Honolulu."),
+                         self.example("Q2", "P27", "France", "Macron lives in Paris."),
+                         self.example("Q3", "P19", "Rome", "Mario was born in Rome, not in France.")]}
+        negatives = self.builder._create_negatives(qas)
+        # Q1 and Q3 have the same property, and the sentence of Q3 contains the answer of Q2
+        self.assertListEqual([("Q1", "Q2")],
+                             [(negative['source_a'], negative['source_b']) for negative in negatives])
+        self.assertTrue(all(negative['example'] == "negative" and negative['answer'] == "" for negative in negatives))
+
+
+if __name__ == '__main__':
+    unittest.main()
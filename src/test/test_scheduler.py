@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+
+from utils.checkpoint import CheckpointLedger
+from utils.scheduler import get_guided_chunks, plan_chunks, total_cost
+
+
+class CostCollection(object):
+    """
+    A collection of documents with a precomputed cost, answering the pipelines of the scheduler
+    """
+
+    def __init__(self, documents):
+        self.documents = documents
+        self.pipelines = []
+
+    def estimated_document_count(self):
+        return len(self.documents)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.pipelines.append(pipeline)
+        if "$sample" in pipeline[0]:
+            sample = self.documents[:pipeline[0]["$sample"]["size"]]
+            return [{"_id": None, "cost": sum(doc['cost'] for doc in sample) / len(sample)}]
+        return iter(self.documents)
+
+
+class TestGuidedChunks(unittest.TestCase):
+    def setUp(self):
+        self.documents = [{"id": i, "cost": 10} for i in range(1000)]
+        self.total = sum(doc['cost'] for doc in self.documents)
+
+    def test_covers_all(self):
+        chunks = list(get_guided_chunks(self.documents, self.total, 1000, 4, "id", min_size=5, max_size=200))
+        self.assertEqual(0, chunks[0][0])
+        self.assertEqual(999, chunks[-1][1])
+        for (_, upper), (lower, _) in zip(chunks, chunks[1:]):
+            self.assertEqual(upper + 1, lower)
+
+    def test_decreasing(self):
+        chunks = list(get_guided_chunks(self.documents, self.total, 1000, 4, "id", min_size=5, max_size=200))
+        sizes = [upper - lower + 1 for lower, upper in chunks]
+        self.assertLessEqual(max(sizes), 200)
+        self.assertGreater(sizes[0], sizes[-2])
+        self.assertGreaterEqual(min(sizes[:-1]), 5)
+
+    def test_heavy(self):
+        self.documents[500]['cost'] = 100000
+        total = sum(doc['cost'] for doc in self.documents)
+        chunks = list(get_guided_chunks(self.documents, total, 1000, 4, "id", min_size=5, max_size=200))
+        self.assertIn((500, 500), chunks)
+
+
+class TestPlanChunks(unittest.TestCase):
+    def setUp(self):
+        self.collection = CostCollection([{"id": i, "cost": 10} for i in range(1000)])
+
+    def test_total_cost(self):
+        self.assertEqual((10000, 1000), total_cost(self.collection, {}, sample_size=100))
+        self.assertEqual({"$sample": {"size": 100}}, self.collection.pipelines[0][0])
+        self.assertEqual((0, 0), total_cost(CostCollection([]), {}))
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as folder:
+            ledger = CheckpointLedger(os.path.join(folder, "checkpoint.db"))
+            chunks = list(plan_chunks(self.collection, "id", {}, ledger, 4, 5, 200))
+            for chunk in chunks[:3]:
+                ledger.mark_done(chunk, {})
+
+            # The plan of the first run is kept when the parameters change
+            with self.assertLogs(level="WARNING"):
+                resumed = list(plan_chunks(self.collection, "id", {}, ledger, 8, 5, 100))
+            self.assertListEqual(chunks[3:], resumed)
+            self.assertEqual(1, sum("$sample" in pipeline[0] for pipeline in self.collection.pipelines))
+            ledger.close()
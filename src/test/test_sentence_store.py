@@ -0,0 +1,48 @@
+import hashlib
+import unittest
+
+from test.fakes import DictCollection
+from utils.sentence_store import SentenceStore
+
+
+def get_id(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class TestSentenceStore(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+    def segmenter(self, text):
+        self.calls += 1
+        return [sentence.strip() + "." for sentence in text.split(".") if sentence.strip()]
+
+    def test_split_batch(self):
+        collection = DictCollection()
+        texts = ["Obama è nato a Honolulu. Ha studiato alla Columbia.", "", "Finale Emilia è un comune."]
+        expected = [self.segmenter(text) for text in texts]
+        self.calls = 0
+
+        store = SentenceStore(self.segmenter, "italian", get_id, collection)
+        self.assertListEqual(expected, store.split_batch(texts))
+        self.assertEqual(2, self.calls)
+
+        store = SentenceStore(self.segmenter, "italian", get_id, collection)
+        self.assertListEqual(expected, store.split_batch(texts))
+        self.assertEqual(2, self.calls)
+        self.assertEqual({"sentence_store_hits": 2, "sentence_store_misses": 0, "sentence_store_hit_rate": 1.0},
+                         store.stats())
+
+        store.reset_stats()
+        store.split(texts[2])
+        self.assertEqual({"sentence_store_hits": 1, "sentence_store_misses": 0, "sentence_store_hit_rate": 1.0},
+                         store.stats())
+
+        SentenceStore(self.segmenter, "english", get_id, collection).split(texts[0])
+        self.assertEqual(3, self.calls)
+
+    def test_without_collection(self):
+        store = SentenceStore(self.segmenter, "italian", get_id)
+        store.split("Finale Emilia è un comune.")
+        store.split("Finale Emilia è un comune.")
+        self.assertEqual(2, self.calls)
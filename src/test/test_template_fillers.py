@@ -1,6 +1,7 @@
 import unittest
 
-from utils.template_fillers import ItalianTemplateFiller
+from utils.template_fillers import FrenchTemplateFiller, GermanTemplateFiller, ItalianTemplateFiller, \
+    SpanishTemplateFiller
 
 
 class TestItalianTemplateFiller(unittest.TestCase):
@@ -32,3 +33,31 @@ class TestItalianTemplateFiller(unittest.TestCase):
         filler = ItalianTemplateFiller()
         template = filler.fill("Quando è uscitGGG YYY XXX?", "La conversazione", article="La")
         self.assertEqual("Quando è uscita La conversazione?", template)
+
+    def test_memoized(self):
+        filler = ItalianTemplateFiller()
+
+        for entity in ["Stati Uniti", "Gli Stati Uniti", "Stati Uniti"]:
+            template = filler.fill("Chi è il presidente diYYY XXX?", entity, article="Gli")
+            self.assertEqual("Chi è il presidente degli Stati Uniti?", template)
+        self.assertEqual(2, len(filler._plans))
+
+
+class TestTemplateFillers(unittest.TestCase):
+    def test_spanish(self):
+        filler = SpanishTemplateFiller()
+        self.assertEqual("¿Cuál es la capital del Salvador?",
+                         filler.fill("¿Cuál es la capital deYYY XXX?", "Salvador", article="El"))
+        self.assertEqual("¿Dónde está Los Angeles?", filler.fill("¿Dónde está YYY XXX?", "Los Angeles", article="Los"))
+
+    def test_french(self):
+        filler = FrenchTemplateFiller()
+        self.assertEqual("Quelle est la capitale d'Italie ?", filler.fill("Quelle est la capitale de XXX ?", "Italie"))
+        self.assertEqual("Quelle est la capitale de France ?", filler.fill("Quelle est la capitale de XXX ?", "France"))
+
+    def test_german(self):
+        filler = GermanTemplateFiller()
+        self.assertEqual("Die Zeit wurde wann gegründet?",
+                         filler.fill("YYY XXX wurde wann gegründet?", "Zeit", article="Die"))
+        self.assertEqual("Die Zeit wurde wann gegründet?",
+                         filler.fill("YYY XXX wurde wann gegründet?", "Die Zeit", article="Die"))
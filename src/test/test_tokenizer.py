@@ -1,8 +1,11 @@
+import multiprocessing
 import re
 import unittest
 
+from tokenizers.TokenizerI import TokenizerI
 from tokenizers.polyglot_tokenizer import PolyglotTokenizer
 from tokenizers.spacy_tokenizer import SpacyTokenizer
+from tokenizers.utils import align_tokens
 
 
 class TestSpacyTokenizer(unittest.TestCase):
@@ -729,6 +732,25 @@ algebra dei sedenioni (algebra associativa sulle potenze, come tutte le altre de
         rebuilt = rebuild_sentence(0, len(tokens), tokens, break_levels)
         self.assertEqual(text, rebuilt)
 
+    def test_tokenize_batch(self):
+        texts = ["Finale Emilia è un comune italiano.", "Stati Uniti d'America", "", "4 agosto 1961"]
+        tokenizer = SpacyTokenizer('it')
+        self.assertListEqual([tokenizer.tokenize(text) for text in texts], tokenizer.tokenize_batch(texts))
+
+    def test_tokenize_with_offsets(self):
+        assert_offsets(self, SpacyTokenizer('it'), OFFSETS_TEXT)
+
+    def test_tokenize_batch_in_pool(self):
+        # The pool workers are daemonic, n_process falls back to 1 in them
+        texts = ["Finale Emilia è un comune italiano.", "4 agosto 1961"]
+        with multiprocessing.Pool(1) as pool:
+            self.assertListEqual([SpacyTokenizer('it').tokenize(text) for text in texts],
+                                 pool.apply(tokenize_batch, (texts, 2)))
+
+
+def tokenize_batch(texts, n_process):
+    return SpacyTokenizer('it', n_process=n_process).tokenize_batch(texts)
+
 
 SEP_MAPPING = {
     0: '',
@@ -756,3 +778,39 @@ class TestKannadaTokenizer(unittest.TestCase):
         rebuilt = rebuild_sentence(0, len(tokens), tokens, break_levels)
         self.assertEqual(rebuilt, text)
         self.assertEqual(len(tokens), len(break_levels))
+
+
+class TestBreakLevels(unittest.TestCase):
+
+    def test_break_levels(self):
+        tokenizer = SpacyTokenizer('it')
+        text = "Finale Emilia è un comune.  Dista 42 km.\n Formigine\n\n\"Finale\""
+        tokens = ["Finale", "Emilia", "è", "un", "comune", ".", "Dista", "42", "km", ".", "Formigine", "\"", "Finale",
+                  "\""]
+        break_levels = tokenizer._get_break_levels(text, tokens, align_tokens(tokens, text))
+        self.assertListEqual([0, 1, 1, 1, 1, 0, 3, 1, 1, 0, 2, 4, 0, 0], break_levels)
+        self.assertEqual(text.replace("  ", " ").replace("\n ", "\n"), rebuild_sentence(0, len(tokens), tokens,
+                                                                                          break_levels))
+
+
+OFFSETS_TEXT = "Finale Emilia è un comune  italiano.\nDista 42 km da Modena.\n\nFinale"
+
+
+def assert_offsets(test, tokenizer, text):
+    tokens, break_levels, pos_tagger_seq, spans = tokenizer.tokenize_with_offsets(text)
+    test.assertEqual((tokens, break_levels, pos_tagger_seq), tokenizer.tokenize(text))
+    test.assertListEqual(tokens, [text[start:end] for start, end in spans])
+    test.assertListEqual(sorted(spans), spans)
+
+
+class TestTokenizeWithOffsets(unittest.TestCase):
+    def test_polyglot(self):
+        assert_offsets(self, PolyglotTokenizer(), OFFSETS_TEXT)
+
+    def test_default(self):
+        class WhitespaceTokenizer(TokenizerI):
+            def tokenize(self, text):
+                tokens = text.split()
+                return tokens, [0] + [1] * (len(tokens) - 1), tokens
+
+        assert_offsets(self, WhitespaceTokenizer(), OFFSETS_TEXT)
@@ -0,0 +1,26 @@
+import unittest
+
+from tokenizers.utils import TokenOffsets, align_tokens
+
+
+class TestAlignTokens(unittest.TestCase):
+    def test_align(self):
+        text = "Obama è nato negli Stati Uniti d'America,  nel 1961."
+        tokens = ["Obama", "è", "nato", "negli", "Stati", "Uniti", "d'", "America", ",", "nel", "1961", "."]
+        spans = align_tokens(tokens, text)
+        self.assertListEqual(tokens, [text[start:end] for start, end in spans])
+
+    def test_missing(self):
+        self.assertRaises(ValueError, align_tokens, ["Obama", "&amp;"], "Obama & Biden")
+
+
+class TestTokenOffsets(unittest.TestCase):
+    def test_tokens(self):
+        text = "Obama è nato negli Stati Uniti d'America."
+        tokens = ["Obama", "è", "nato", "negli", "Stati", "Uniti", "d'", "America", "."]
+        offsets = TokenOffsets(align_tokens(tokens, text))
+        start = text.index("Stati Uniti")
+        self.assertEqual(range(4, 6), offsets.tokens(start, start + len("Stati Uniti")))
+        self.assertEqual(range(8, 9), offsets.tokens(len(text) - 1, len(text)))
+        self.assertIsNone(offsets.tokens(start, start + len("Stati Un")))
+        self.assertIsNone(offsets.tokens(start + 1, start + len("Stati")))
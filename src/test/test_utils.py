@@ -0,0 +1,23 @@
+import unittest
+
+from utils.utils import get_chunks, language_value
+
+
+class TestGetChunks(unittest.TestCase):
+    def test_list(self):
+        documents = [{"id": "Q{}".format(i)} for i in range(7)]
+        self.assertListEqual([("Q0", "Q2"), ("Q3", "Q5"), ("Q6", "Q6")], list(get_chunks(documents, 3, "id")))
+
+    def test_stream(self):
+        documents = ({"id": i} for i in range(6))
+        self.assertListEqual([(0, 2), (3, 5)], list(get_chunks(documents, 3, "id")))
+        self.assertListEqual([], list(get_chunks(iter([]), 3, "id")))
+
+
+class TestLanguageValue(unittest.TestCase):
+    def test_empty_map(self):
+        entity = {"labels": {"en": {"language": "en", "value": "human"}}, "aliases": []}
+        self.assertEqual("human", language_value(entity, "labels", "en")['value'])
+        self.assertIsNone(language_value(entity, "labels", "it"))
+        self.assertListEqual([], language_value(entity, "aliases", "en", []))
+        self.assertListEqual([], language_value(entity, "descriptions", "en", []))
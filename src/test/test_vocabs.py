@@ -0,0 +1,29 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from utils.vocabs import Vocabulary, save_vocab
+
+
+class TestVocabulary(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "document.vocab")
+        save_vocab(self.path, Counter({"the": 10, "of": 5, "Rome": 2}))
+        self.vocab = Vocabulary.load(self.path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_encode(self):
+        ids = self.vocab.encode(["the", "Rome", "Paris"])
+        self.assertListEqual([4, 6, 2], ids.tolist())
+
+    def test_oov(self):
+        oov = {}
+        sequence = self.vocab.encode(["the", "Paris", "of", "Milan", "Paris"], oov)
+        answer = self.vocab.encode(["Paris"], oov)
+        self.assertEqual(sequence[1], answer[0])
+        self.assertNotEqual(sequence[1], sequence[3])
+        self.assertListEqual([4, 2, 5, 2, 2], self.vocab.to_ids(sequence))
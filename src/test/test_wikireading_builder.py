@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+
+from builders.WikiReading import WikiReadingBuilder
+from test.fakes import ListCollection
+from utils.vocabs import Vocabulary, save_vocab
+
+
+class WhitespaceTokenizer(object):
+    def __init__(self):
+        self.batches = 0
+
+    def tokenize(self, text):
+        tokens = text.split()
+        return tokens, [0] + [1] * (len(tokens) - 1), tokens
+
+    def tokenize_batch(self, texts):
+        self.batches += 1
+        return [self.tokenize(text) for text in texts]
+
+
+def source_document():
+    return {"id": "Q76", "label": "Barack Obama", "text": "Barack Obama was born in Honolulu in 1961 .",
+            "properties": {"P19": {"label": "place of birth"}, "P569": {"label": "date of birth"}},
+            "facts": {"P19": [{"value": "Honolulu"}], "P569": [{"value": "1961"}, {"value": "4 August 1961"}]}}
+
+
+class TestWikiReadingBuilder(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WhitespaceTokenizer()
+        self.builder = WikiReadingBuilder("localhost", 27017, "test", "source", "destination", self.tokenizer)
+        self.builder._source = ListCollection([source_document()])
+        self.builder._destination = ListCollection()
+
+    def test_build(self):
+        res = self.builder.build(("Q1", "Q9"))
+        self.assertEqual(1, res['processed'])
+        self.assertEqual(2, res['questions'])
+        self.assertEqual(2, res['answers_found'])
+
+        document = self.builder._destination.docs[0]
+        self.assertEqual("Q76", document['id'])
+        questions = {question['prop_id']: question for question in document['questions']}
+        self.assertListEqual([[5]], questions['P19']['full_match_answer_location'])
+        self.assertListEqual(["place", "of", "birth"], questions['P19']['question_string_sequence'])
+        self.assertListEqual(["1961", "4", "August", "1961"], questions['P569']['answer_string_sequence'])
+        self.assertListEqual([1], questions['P569']['answer_breaks'])
+        self.assertListEqual([[7]], questions['P569']['full_match_answer_location'])
+
+    def test_build_batched(self):
+        documents = [source_document(), source_document(), {"id": "Q2", "text": " ", "label": "", "properties": {},
+                                                            "facts": {}}]
+        documents[1]['id'] = "Q77"
+        self.builder._source = ListCollection(documents)
+        res = self.builder.build(("Q1", "Q9"))
+        self.assertEqual(2, res['processed'])
+        self.assertEqual(4, res['questions'])
+        # One call for the articles and one for the labels and values of the whole batch
+        self.assertEqual(2, self.tokenizer.batches)
+        self.assertListEqual(["Q76", "Q77"], [document['id'] for document in self.builder._destination.docs])
+
+    def test_build_stats(self):
+        # The builder of a worker is reused for all its chunks, the stats are the ones of each chunk
+        first = self.builder.build(("Q1", "Q9"))
+        second = self.builder.build(("Q1", "Q9"))
+        self.assertGreater(first['tokenizer_misses'], 0)
+        self.assertEqual(0, second['tokenizer_misses'])
+        self.assertEqual(first['tokenizer_hits'] + first['tokenizer_misses'], second['tokenizer_hits'])
+
+    def test_answer_vocab(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "answer.vocab")
+            save_vocab(path, Counter({"1961": 3, "August": 2, "4": 1}))
+            builder = WikiReadingBuilder("localhost", 27017, "test", "source", "destination", self.tokenizer,
+                                         answer_vocab_path=path)
+            vocab = Vocabulary.load(path)
+        builder._source = ListCollection([source_document()])
+        builder._destination = ListCollection()
+        builder.build(("Q1", "Q9"))
+        questions = {question['prop_id']: question for question in builder._destination.docs[0]['questions']}
+        # The answers are encoded token by token, as the vocabulary was built
+        self.assertListEqual([[vocab.get("1961")], [vocab.get("4"), vocab.get("August"), vocab.get("1961")]],
+                             questions['P569']['raw_answer_ids'])
+        self.assertNotIn(vocab.get("<UNK>"), questions['P569']['raw_answer_ids'][1])
+        self.assertListEqual([[vocab.get("<UNK>")]], questions['P19']['raw_answer_ids'])
@@ -1,5 +1,7 @@
 from abc import ABC
 
+from tokenizers.utils import align_tokens
+
 SENTENCE_BREAKS = {'.', '!', '?', '…', '...'}
 
 
@@ -18,6 +20,50 @@ class TokenizerI(ABC):
     def tokenize(self, text):
         raise NotImplemented
 
-    # ToDo Add unique logic for all tokenizers
-    def _get_break_levels(self, tokens):
-        raise NotImplemented
\ No newline at end of file
+    def tokenize_with_offsets(self, text):
+        """
+        Tokenizes the text keeping the character offsets of the tokens
+        :param text:
+        :return: The tokens, break levels and pos tagger sequence, followed by the (start, end) offsets of the tokens
+        """
+        tokens, break_levels, pos_tagger_seq = self.tokenize(text)
+        return tokens, break_levels, pos_tagger_seq, align_tokens(tokens, text)
+
+    def tokenize_batch(self, texts):
+        """
+        Tokenizes a batch of texts, subclasses can override it to process the batch more efficiently
+        :param texts:
+        :return: The list of the (tokens, break_levels, pos_tagger_seq) triples of the texts
+        """
+        return [self.tokenize(text) for text in texts]
+
+    def _get_break_levels(self, text, tokens, spans):
+        """
+        Computes the break level before each token from the characters between it and the previous one, so there is
+        exactly one break level per token
+        :param text: The tokenized text
+        :param tokens: The tokens, without the whitespace ones
+        :param spans: The (start, end) offsets of the tokens in the text
+        :return:
+        """
+        space = self.BREAK_LEVEL_TOKENS[" "]
+        newline = self.BREAK_LEVEL_TOKENS["\n"]
+        sentence_break = self.BREAK_LEVEL_TOKENS["SENTENCE_BREAK"]
+        paragraph = self.BREAK_LEVEL_TOKENS["\n\n"]
+        break_levels = [0] * len(spans)
+        for i in range(1, len(spans)):
+            previous_end = spans[i - 1][1]
+            start = spans[i][0]
+            if start <= previous_end:
+                continue
+            newlines = text.count("\n", previous_end, start)
+            if newlines > 1:
+                break_levels[i] = paragraph
+            elif newlines:
+                break_levels[i] = newline
+            elif tokens[i - 1] in self.SENTENCE_BREAKS:
+                break_levels[i] = sentence_break
+            else:
+                break_levels[i] = space
+
+        return break_levels
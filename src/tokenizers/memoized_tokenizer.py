@@ -0,0 +1,88 @@
+from collections import OrderedDict
+
+
+class MemoizedTokenizer(object):
+    """
+    Bounded LRU memoization in front of a tokenization function, for the short strings (labels, values, dates) that
+    are tokenized again in every document
+    """
+
+    def __init__(self, tokenize, tokenize_batch=None, max_size=100000, max_length=64):
+        """
+        :param tokenize: The tokenization function
+        :param tokenize_batch: The batch tokenization function, if the tokenizer has one
+        :param max_size: Maximum number of memoized strings
+        :param max_length: Only the strings up to this length are memoized
+        """
+        self._tokenize = tokenize
+        self._tokenize_batch = tokenize_batch
+        self._max_size = max_size
+        self._max_length = max_length
+        self._cache = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def tokenize(self, text):
+        if len(text) > self._max_length:
+            return self._tokenize(text)
+        if text in self._cache:
+            self._hits += 1
+            self._cache.move_to_end(text)
+            return self._copy(self._cache[text])
+        self._misses += 1
+        result = self._tokenize(text)
+        self._add(text, result)
+        return self._copy(result)
+
+    def tokenize_batch(self, texts):
+        results = [None] * len(texts)
+        # The positions of each distinct text that is not memoized, tokenized only once
+        missing = OrderedDict()
+        for i, text in enumerate(texts):
+            if len(text) <= self._max_length and text in self._cache:
+                self._hits += 1
+                self._cache.move_to_end(text)
+                results[i] = self._copy(self._cache[text])
+            else:
+                missing.setdefault(text, []).append(i)
+
+        missing_texts = list(missing)
+        if self._tokenize_batch:
+            tokenized = self._tokenize_batch(missing_texts)
+        else:
+            tokenized = [self._tokenize(text) for text in missing_texts]
+        for text, result in zip(missing_texts, tokenized):
+            positions = missing[text]
+            if len(text) <= self._max_length:
+                self._misses += 1
+                self._hits += len(positions) - 1
+                self._add(text, result)
+            for i in positions:
+                results[i] = self._copy(result)
+        return results
+
+    def _add(self, text, result):
+        self._cache[text] = result
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _copy(result):
+        # The callers extend the returned lists, so the memoized ones are never handed out
+        if isinstance(result, tuple):
+            return tuple(list(element) if isinstance(element, list) else element for element in result)
+        if isinstance(result, list):
+            return list(result)
+        return result
+
+    def reset_stats(self):
+        """
+        Resets the counters, the memoized strings are kept
+        """
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self):
+        lookups = self._hits + self._misses
+        return {"tokenizer_hits": self._hits, "tokenizer_misses": self._misses,
+                "tokenizer_hit_rate": round(self._hits / lookups, 4) if lookups else 0.0}
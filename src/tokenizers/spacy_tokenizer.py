@@ -1,4 +1,6 @@
-from typing import Tuple, List
+import logging
+import multiprocessing
+from typing import Iterable, Tuple, List
 
 import spacy
 
@@ -6,50 +8,39 @@ from tokenizers.TokenizerI import TokenizerI
 
 
 class SpacyTokenizer(TokenizerI):
-    def __init__(self, lang, **kwargs):
+    def __init__(self, lang, batch_size=1000, n_process=1, **kwargs):
         super().__init__()
         self._tokenizer = spacy.load("xx", **kwargs)
+        self._batch_size = batch_size
+        self._n_process = n_process
 
     def tokenize(self, text: str) -> Tuple[List[str], List[int], List[str]]:
-        doc = self._tokenizer(text)
-        break_levels = self._get_break_levels(doc)
+        return self._process(self._tokenizer(text))[:3]
+
+    def tokenize_with_offsets(self, text: str) -> Tuple[List[str], List[int], List[str], List[Tuple[int, int]]]:
+        return self._process(self._tokenizer(text))
+
+    def tokenize_batch(self, texts: Iterable[str]) -> List[Tuple[List[str], List[int], List[str]]]:
+        if self._n_process != 1 and multiprocessing.current_process().daemon:
+            # The workers of a pool are daemonic and can't start the processes of spaCy
+            logging.warning("Tokenizing with n_process=1 instead of {} in a pool worker".format(self._n_process))
+            self._n_process = 1
+        docs = self._tokenizer.pipe(texts, batch_size=self._batch_size, n_process=self._n_process)
+        return [self._process(doc)[:3] for doc in docs]
+
+    def _process(self, doc) -> Tuple[List[str], List[int], List[str], List[Tuple[int, int]]]:
+        filtered_tokens = []
+        spans = []
+        for token in doc:
+            text = token.text.strip()
+            if not text:
+                continue
+            start = token.idx + token.text.index(text)
+            filtered_tokens.append(text)
+            spans.append((start, start + len(text)))
+        break_levels = self._get_break_levels(doc.text, filtered_tokens, spans)
         pos_tagger_seq = []
-        filtered_tokens = [token.text.strip() for token in doc if
-                           token.text.strip(" ") not in self.BREAK_LEVEL_TOKENS if token.text.strip()]
         for token in filtered_tokens:
             element = token + "\n" if token in self.SENTENCE_BREAKS else token
             pos_tagger_seq.append(element)
-        # if len(filtered_tokens) != len(break_levels):
-        #    print(repr(text))
-        # assert len(filtered_tokens) == len(break_levels)
-        return filtered_tokens, break_levels, pos_tagger_seq
-
-    # Bugged
-    def _get_break_levels(self, tokens):
-        token_separators = [0]
-        i = 0
-        for prev, curr, next in zip(tokens, tokens[1:], tokens[2:]):
-            i += 1
-            if curr.text.strip(" ") in self.BREAK_LEVEL_TOKENS:
-                token_separators.append(self.BREAK_LEVEL_TOKENS[curr.text.strip(" ")])
-                continue
-            if curr.text.strip(" ") in self.SENTENCE_BREAKS:
-                separator = 1 if prev.whitespace_ else 0
-                token_separators.append(separator) if prev.text.strip(" ") not in self.BREAK_LEVEL_TOKENS else None
-                if next.text.strip(" ") not in self.BREAK_LEVEL_TOKENS and curr.whitespace_:
-                    token_separators.append(self.BREAK_LEVEL_TOKENS['SENTENCE_BREAK'])
-                elif next.text.strip(" ") not in self.BREAK_LEVEL_TOKENS:
-                    token_separators.append(0)
-                continue
-            if prev.text.strip(" ") not in self.SENTENCE_BREAKS \
-                    and prev.text.strip(" ") not in self.BREAK_LEVEL_TOKENS:
-                separator = 1 if prev.whitespace_ else 0
-                token_separators.append(separator)
-
-            if len(tokens) == i + 2:
-                if not curr.whitespace_:
-                    token_separators.append(0)
-                else:
-                    token_separators.append(1)
-
-        return token_separators
\ No newline at end of file
+        return filtered_tokens, break_levels, pos_tagger_seq, spans
@@ -1,6 +1,7 @@
 """
-Taken from NLTK library
+align_tokens taken from NLTK library
 """
+from bisect import bisect_left
 
 
 def align_tokens(tokens, sentence):
@@ -17,10 +18,44 @@ def align_tokens(tokens, sentence):
     point = 0
     offsets = []
     for token in tokens:
-        try:
-            start = sentence.index(token, point)
-        except ValueError:
-            raise ValueError('substring "{}" not found in "{}"'.format(token, sentence))
+        # The tokens are usually right after the previous one or its whitespace, the search is the fallback
+        if sentence.startswith(token, point):
+            start = point
+        elif sentence.startswith(token, point + 1):
+            start = point + 1
+        else:
+            try:
+                start = sentence.index(token, point)
+            except ValueError:
+                raise ValueError('substring "{}" not found in "{}"'.format(token, sentence))
         point = start + len(token)
         offsets.append((start, point))
     return offsets
+
+
+class TokenOffsets(object):
+    """
+    Maps character spans of a text to the tokens that cover them, given the offsets of the tokens
+    """
+
+    def __init__(self, spans):
+        """
+        :param spans: The (start, end) offsets of the tokens, as returned by align_tokens
+        """
+        self._starts = [start for start, _ in spans]
+        self._ends = [end for _, end in spans]
+
+    def tokens(self, start, end):
+        """
+        Returns the range of the tokens from the character start to the character end
+        :param start:
+        :param end:
+        :return: The range of the token positions, None if the span does not start and end on token boundaries
+        """
+        first = bisect_left(self._starts, start)
+        last = bisect_left(self._ends, end)
+        if first >= len(self._starts) or last >= len(self._ends) or last < first:
+            return None
+        if self._starts[first] != start or self._ends[last] != end:
+            return None
+        return range(first, last + 1)
@@ -6,7 +6,7 @@ import sys
 from pymongo import MongoClient
 
 import config
-from utils import load_props
+from utils.utils import load_props
 
 
 def get_id_for_qa(page_id, prop_id, answer_id):
@@ -1,27 +1,50 @@
 import re
 from abc import ABC
+from functools import lru_cache
 
 
 class ArticleExtractorI(ABC):
-    def __init__(self):
+    def __init__(self, lead_size=1000, max_size=10000):
+        """
+        :param lead_size: Number of characters at the beginning of the text where the article is searched
+        :param max_size: Maximum number of cached patterns and entity articles
+        """
         self._articles = []
         self._re_template = ''
+        self._lead_size = lead_size
+        self._pattern = lru_cache(maxsize=max_size)(self._compile)
+        self._entity_article = lru_cache(maxsize=max_size)(self._find_entity_article)
 
     def extract(self, text, entity):
-        article = ''
-        pattern = self._re_template.format("")
-        match = re.search("^" + pattern, entity, re.IGNORECASE)
-        if match:
-            article = match.group('article')
+        article = self._entity_article(entity)
+        if article is not None:
             return article
 
-        pattern = self._re_template.format(re.escape(entity.split()[0]))
-        match = re.search(pattern, text, re.IGNORECASE)
+        match = self._pattern(entity.split()[0]).search(text, 0, self._search_end(text))
         if match:
             article = match.group('article')
             return article
 
-        return article
+        return ''
+
+    def _search_end(self, text):
+        """
+        :param text:
+        :return: The position where the search of the article in the text stops
+        """
+        return self._lead_size
+
+    def _compile(self, word):
+        return re.compile(self._re_template.format(re.escape(word)), re.IGNORECASE)
+
+    def _find_entity_article(self, entity):
+        """
+        Finds the article at the beginning of the entity label
+        :param entity:
+        :return: The article, None if the label doesn't start with one
+        """
+        match = self._pattern("").match(entity)
+        return match.group('article') if match else None
 
 
 class DummyArticleExtractor(ArticleExtractorI):
@@ -30,36 +53,37 @@ class DummyArticleExtractor(ArticleExtractorI):
 
 
 class ItalianArticleExtractor(ArticleExtractorI):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self._articles = ['Il', 'Lo', 'La', 'I', 'Gli', 'Le', 'L']
         self._re_template = "(?P<article>" + "|".join(
             ["\\b" + article + "\\b" for article in self._articles]) + ")(\s?|\'){}"
 
 
 class FrenchArticleExtractor(ArticleExtractorI):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self._articles = ['Le', 'La', 'L', 'Les']
         self._re_template = "(?P<article>" + "|".join(
             ["\\b" + article + "\\b" for article in self._articles]) + ")(\s?|\'){}"
 
 
 class GermanArticleExtractor(ArticleExtractorI):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self._articles = ['Der', 'Die', 'Das', 'Ein', 'Eine']
         self._re_template = "(?P<article>" + "|".join(
             ["\\b" + article + "\\b" for article in self._articles]) + ")(\s){}"
 
-    def extract(self, text, entity):
-        text = text.split("\n")[0]
-        return super().extract(text, entity)
+    def _search_end(self, text):
+        # The first line of the lead, without splitting the whole text
+        end = text.find("\n", 0, self._lead_size)
+        return self._lead_size if end < 0 else end
 
 
 class SpanishArticleExtractor(ArticleExtractorI):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
         self._articles = ['El', 'La', 'Los', 'Las']
         self._re_template = "(?P<article>" + "|".join(
             ["\\b" + article + "\\b" for article in self._articles]) + ")(\s){}"
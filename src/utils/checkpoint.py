@@ -0,0 +1,86 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+
+class CheckpointLedger(object):
+    """
+    Records in a SQLite file the chunks started and completed by a driver, so that a rerun can skip the completed ones
+    and replace the output of the interrupted ones only, and the plan the chunks were computed with
+    """
+
+    def __init__(self, path):
+        # The chunks are marked started by the thread of the pool that dispatches them, and done by the driver
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._connection.execute("CREATE TABLE IF NOT EXISTS chunks (lower TEXT, upper TEXT, completed REAL, "
+                                 "stats TEXT, PRIMARY KEY (lower, upper))")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS plan (id INTEGER PRIMARY KEY CHECK (id = 0), "
+                                 "parameters TEXT)")
+        self._connection.commit()
+
+    def _chunks(self, completed: bool) -> Set[Tuple[str, str]]:
+        query = "SELECT lower, upper FROM chunks WHERE completed IS {}".format("NOT NULL" if completed else "NULL")
+        with self._lock:
+            return {(lower, upper) for lower, upper in self._connection.execute(query)}
+
+    def done_chunks(self) -> Set[Tuple[str, str]]:
+        return self._chunks(completed=True)
+
+    def started_chunks(self) -> Set[Tuple[str, str]]:
+        """
+        :return: The chunks started but not completed
+        """
+        return self._chunks(completed=False)
+
+    def is_done(self, chunk: Tuple[str, str]) -> bool:
+        query = "SELECT 1 FROM chunks WHERE lower = ? AND upper = ? AND completed IS NOT NULL"
+        with self._lock:
+            return self._connection.execute(query, (str(chunk[0]), str(chunk[1]))).fetchone() is not None
+
+    def mark_started(self, chunk: Tuple[str, str]):
+        with self._lock:
+            self._connection.execute("INSERT OR IGNORE INTO chunks (lower, upper) VALUES (?, ?)",
+                                     (str(chunk[0]), str(chunk[1])))
+            self._connection.commit()
+
+    def mark_done(self, chunk: Tuple[str, str], stats: Dict):
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO chunks (lower, upper, completed, stats) "
+                                     "VALUES (?, ?, ?, ?)",
+                                     (str(chunk[0]), str(chunk[1]), time.time(), json.dumps(stats, default=str)))
+            self._connection.commit()
+
+    def dispatch(self, chunks: Iterable[Tuple]) -> Iterator[Tuple[Tuple, bool]]:
+        """
+        Marks the chunks as started while they are consumed
+        :param chunks:
+        :return: An iterator over the chunks, with whether a previous run started them without completing them, so
+        that their partial output has to be replaced
+        """
+        interrupted = self.started_chunks()
+        for chunk in chunks:
+            self.mark_started(chunk)
+            yield chunk, (str(chunk[0]), str(chunk[1])) in interrupted
+
+    def stats(self, chunk: Tuple[str, str]) -> Dict:
+        query = "SELECT stats FROM chunks WHERE lower = ? AND upper = ?"
+        with self._lock:
+            row = self._connection.execute(query, (str(chunk[0]), str(chunk[1]))).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+    def plan(self) -> Optional[Dict]:
+        with self._lock:
+            row = self._connection.execute("SELECT parameters FROM plan WHERE id = 0").fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_plan(self, plan: Dict):
+        with self._lock:
+            self._connection.execute("INSERT OR REPLACE INTO plan (id, parameters) VALUES (0, ?)",
+                                     (json.dumps(plan),))
+            self._connection.commit()
+
+    def close(self):
+        self._connection.close()
@@ -1,9 +1,9 @@
 import datetime
-import locale
 from abc import ABC
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
 
 import numeral
-from dateutil.parser import parse
 from natural.number import ordinal
 
 MILLENNIUM_TOKEN = {
@@ -36,16 +36,121 @@ BC_TOKEN = {
 }
 
 MONTH_TEMPLATE = {
-    'es': '%B de %#Y',
-    'ca': '%B de %#Y'
+    'es': '{month} de {year}',
+    'ca': '{month} de {year}'
 }
 
 DAY_TEMPLATE = {
-    'es': "%#d de %B de %#Y",
-    'ca': "%#d de %B de %#Y",
-    'de': "%#d. %B %#Y",
-    'it': "%#d{suff} %B %#Y",
-    'fr': "%#d{suff} %B %#Y"
+    'es': "{day} de {month} de {year}",
+    'ca': "{day} {month} de {year}",
+    'de': "{day}. {month} {year}",
+    'it': "{day}{suff} {month} {year}",
+    'fr': "{day}{suff} {month} {year}"
+}
+
+MONTH_NAMES = {
+    'en': {
+        1: 'January',
+        2: 'February',
+        3: 'March',
+        4: 'April',
+        5: 'May',
+        6: 'June',
+        7: 'July',
+        8: 'August',
+        9: 'September',
+        10: 'October',
+        11: 'November',
+        12: 'December'
+    },
+    'it': {
+        1: 'gennaio',
+        2: 'febbraio',
+        3: 'marzo',
+        4: 'aprile',
+        5: 'maggio',
+        6: 'giugno',
+        7: 'luglio',
+        8: 'agosto',
+        9: 'settembre',
+        10: 'ottobre',
+        11: 'novembre',
+        12: 'dicembre'
+    },
+    'es': {
+        1: 'enero',
+        2: 'febrero',
+        3: 'marzo',
+        4: 'abril',
+        5: 'mayo',
+        6: 'junio',
+        7: 'julio',
+        8: 'agosto',
+        9: 'septiembre',
+        10: 'octubre',
+        11: 'noviembre',
+        12: 'diciembre'
+    },
+    'fr': {
+        1: 'janvier',
+        2: 'février',
+        3: 'mars',
+        4: 'avril',
+        5: 'mai',
+        6: 'juin',
+        7: 'juillet',
+        8: 'août',
+        9: 'septembre',
+        10: 'octobre',
+        11: 'novembre',
+        12: 'décembre'
+    },
+    'de': {
+        1: 'Januar',
+        2: 'Februar',
+        3: 'März',
+        4: 'April',
+        5: 'Mai',
+        6: 'Juni',
+        7: 'Juli',
+        8: 'August',
+        9: 'September',
+        10: 'Oktober',
+        11: 'November',
+        12: 'Dezember'
+    },
+    'ca': {
+        1: 'gener',
+        2: 'febrer',
+        3: 'març',
+        4: 'abril',
+        5: 'maig',
+        6: 'juny',
+        7: 'juliol',
+        8: 'agost',
+        9: 'setembre',
+        10: 'octubre',
+        11: 'novembre',
+        12: 'desembre'
+    }
+}
+
+# The month names after the day, when they differ from MONTH_NAMES
+DAY_MONTH_NAMES = {
+    'ca': {
+        1: 'de gener',
+        2: 'de febrer',
+        3: 'de març',
+        4: "d'abril",
+        5: 'de maig',
+        6: 'de juny',
+        7: 'de juliol',
+        8: "d'agost",
+        9: 'de setembre',
+        10: "d'octubre",
+        11: 'de novembre',
+        12: 'de desembre'
+    }
 }
 
 DAY_SUFFIX = {
@@ -82,8 +187,18 @@ KN_MONTH_MAP = {
 }
 
 
+def parse_time(date: str) -> Tuple[int, int, int]:
+    """
+    Parses the fixed format of the Wikidata time values, without the sign (e.g. 00000001920-01-02T00:00:00Z)
+    :param date:
+    :return: The year, month and day
+    """
+    year, month, day = date.split("T", 1)[0].split("-")
+    return int(year), int(month), int(day)
+
+
 class DateFormatter(ABC):
-    def __init__(self, lang='en', out_locale="en-US"):
+    def __init__(self, lang='en', out_locale="en-US", cache_size=100000):
         self._default_datetime = datetime.datetime(1, 1, 1)
         self._precisions = {
             6: self._parse_millennium,
@@ -93,17 +208,44 @@ class DateFormatter(ABC):
             11: self._parse_day
         }
 
-        if out_locale:
-            locale.setlocale(locale.LC_TIME, out_locale)
+        # The names come from the static tables instead of the process wide locale, so formatters of different
+        # languages can run in the same process. out_locale is kept for the callers
         self._BCE_TOKEN = BC_TOKEN[lang]
         self._millenium_template = MILLENNIUM_TOKEN.get(lang, "")
         self._century_template = CENTURY_TOKEN.get(lang, "")
-        self._day_template = DAY_TEMPLATE.get(lang, "%#d %B %#Y")
-        self._month_template = MONTH_TEMPLATE.get(lang, "%B %#Y")
+        self._day_template = DAY_TEMPLATE.get(lang, "{day} {month} {year}")
+        self._month_template = MONTH_TEMPLATE.get(lang, "{month} {year}")
+        self._month_names = MONTH_NAMES.get(lang, MONTH_NAMES['en'])
+        self._day_month_names = DAY_MONTH_NAMES.get(lang, self._month_names)
         self._year_template = "{year} {era}"
         self._day_suffix = DAY_SUFFIX.get(lang, False)
+        self._format_cached = lru_cache(maxsize=cache_size)(self._format)
 
     def format(self, date: str, precision: int):
+        """
+        Formats a Wikidata time value, the formatted values are memoized as the same dates recur across the dump
+        :param date:
+        :param precision:
+        :return:
+        """
+        return self._format_cached(date, precision)
+
+    def format_batch(self, values: Iterable[Tuple[str, int]]) -> List[Optional[str]]:
+        """
+        Formats a list of Wikidata time values, each distinct value is formatted once
+        :param values: The (date, precision) pairs
+        :return: The formatted values, None for the invalid ones
+        """
+        values = list(values)
+        formatted = {}
+        for value in set(values):
+            try:
+                formatted[value] = self.format(*value)
+            except (ValueError, KeyError, IndexError, OverflowError):
+                formatted[value] = None
+        return [formatted[value] for value in values]
+
+    def _format(self, date: str, precision: int):
         if date.startswith("-"):
             era = self._BCE_TOKEN
         else:
@@ -134,18 +276,16 @@ class DateFormatter(ABC):
         year = int(splitted_date[0])
         month = int(splitted_date[1])
         date = datetime.datetime(year, month, 1)
-        formatted = date.strftime(self._month_template) + " " + era
+        formatted = self._month_template.format(month=self._month_names[date.month], year=date.year) + " " + era
         return formatted.strip()
 
     def _parse_day(self, date, era=""):
-        date = parse(date)
-        formatted = date.strftime(self._day_template) + " " + era
-        if self._day_suffix:
-            if date.day in self._day_suffix:
-                suff = self._day_suffix[date.day]
-            else:
-                suff = ''
-            formatted = formatted.format(suff=suff)
+        date = datetime.datetime(*parse_time(date))
+        suff = ''
+        if self._day_suffix and date.day in self._day_suffix:
+            suff = self._day_suffix[date.day]
+        formatted = self._day_template.format(day=date.day, suff=suff, month=self._day_month_names[date.month],
+                                              year=date.year) + " " + era
 
         return formatted.strip()
 
@@ -196,7 +336,7 @@ class KannadaDateFormatter(DateFormatter):
         return month + " " + year
 
     def _parse_day(self, date, era=""):
-        date = parse(date)
+        date = datetime.datetime(*parse_time(date))
         day = self._num_to_kannada(date.day)
         month = KN_MONTH_MAP[int(date.month)]
         year = self._num_to_kannada(date.year)
@@ -0,0 +1,137 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+WORD_RE = re.compile("\\w+")
+
+
+def boundary_pattern(string: str) -> str:
+    return "\\b" + re.escape(string) + "\\b"
+
+
+class MultiPatternMatcher(object):
+    """
+    Finds which of a set of strings occur, delimited by word boundaries, in a text with a single scan. A lookahead
+    alternation of all the strings gives every position where at least one of them starts, and only the strings
+    beginning with the character at that position are then checked
+    """
+
+    def __init__(self, strings: Iterable[str]):
+        strings = set(strings)
+        self._empty = "" in strings
+        strings.discard("")
+        self._candidates = defaultdict(list)
+        for string in strings:
+            self._candidates[string[0]].append((string, re.compile(boundary_pattern(string))))
+        alternation = "|".join(re.escape(string) for string in sorted(strings, key=len, reverse=True))
+        self._finder = re.compile("(?=\\b(?:" + alternation + ")\\b)") if strings else None
+
+    def find_all(self, text: str) -> Set[str]:
+        return set(self.find_offsets(text))
+
+    def find_offsets(self, text: str) -> Dict[str, int]:
+        """
+        Finds the strings that occur in the text
+        :param text:
+        :return: A dict with the strings found as keys, and the character offset of their first occurrence as value
+        """
+        found = {}
+        if self._empty:
+            empty = re.search("\\b\\b", text)
+            if empty:
+                found[""] = empty.start()
+        if not self._finder:
+            return found
+        for match in self._finder.finditer(text):
+            position = match.start()
+            for string, pattern in self._candidates[text[position]]:
+                if string not in found and pattern.match(text, position):
+                    found[string] = position
+        return found
+
+
+def first_sentences(entity: str, answers: Iterable[str], sentences: List[str], offsets=False) -> Dict:
+    """
+    Finds for every answer the first sentence that contains both the entity and the answer
+    :param entity:
+    :param answers:
+    :param sentences:
+    :param offsets: If the character offset of the answer in the sentence is returned with the sentence
+    :return: A dict with the answers found as keys, and the sentence, or the (sentence, offset) pair, as value
+    """
+    pending = set(answers)
+    matcher = MultiPatternMatcher(pending)
+    entity_re = re.compile(boundary_pattern(entity))
+    res = {}
+    for sentence in sentences:
+        if not pending:
+            break
+        if not entity_re.search(sentence):
+            continue
+        for answer, start in matcher.find_offsets(sentence).items():
+            if answer in pending:
+                res[answer] = (sentence, start) if offsets else sentence
+                pending.discard(answer)
+
+    return res
+
+
+class SentenceIndex(object):
+    """
+    Inverted index from the words to the ids of the sentences containing them. A string delimited by word boundaries
+    can only occur in a sentence that contains all its words, so the index gives the candidate sentences that are
+    then checked with the exact pattern
+    """
+
+    def __init__(self, sentences: List[str]):
+        self._sentences = sentences
+        self._all = set(range(len(sentences)))
+        self._postings = defaultdict(set)
+        self._cache = {}
+        for i, sentence in enumerate(sentences):
+            for word in WORD_RE.findall(sentence):
+                self._postings[word].add(i)
+
+    def candidates(self, string: str) -> Set[int]:
+        """
+        Returns the ids of the sentences that contain all the words of the string
+        :param string:
+        :return:
+        """
+        if string in self._cache:
+            return self._cache[string]
+        words = set(WORD_RE.findall(string))
+        if not words:
+            res = self._all
+        else:
+            postings = sorted((self._postings.get(word, set()) for word in words), key=len)
+            res = set(postings[0])
+            for posting in postings[1:]:
+                if not res:
+                    break
+                res &= posting
+        self._cache[string] = res
+        return res
+
+    def candidates_any(self, strings: Iterable[str]) -> Set[int]:
+        """
+        Returns the ids of the sentences that may contain at least one of the strings
+        :param strings:
+        :return:
+        """
+        res = set()
+        for string in strings:
+            res |= self.candidates(string)
+        return res
+
+    def search(self, pattern, ids: Iterable[int]) -> Set[int]:
+        """
+        Returns the ids of the sentences where the compiled pattern is found
+        :param pattern:
+        :param ids:
+        :return:
+        """
+        return {i for i in ids if pattern.search(self._sentences[i])}
+
+    def __getitem__(self, i):
+        return self._sentences[i]
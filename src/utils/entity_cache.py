@@ -0,0 +1,113 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+
+class SQLiteEntityStore(object):
+    """
+    On disk store of cleaned Wikidata entities. The file can be shared between the processes of a pool, every
+    process opens its own connection to it
+    """
+
+    def __init__(self, path, timeout=60):
+        self._connection = sqlite3.connect(path, timeout=timeout)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS entities (id TEXT PRIMARY KEY, doc TEXT)")
+        self._connection.commit()
+
+    def get_many(self, ids: List[str]) -> Dict[str, Dict]:
+        res = {}
+        # SQLite limits the number of parameters of a query
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            query = "SELECT id, doc FROM entities WHERE id IN ({})".format(",".join("?" * len(chunk)))
+            for eid, doc in self._connection.execute(query, chunk):
+                res[eid] = json.loads(doc)
+        return res
+
+    def update(self, docs: Dict[str, Dict]):
+        rows = [(eid, json.dumps(doc, ensure_ascii=False)) for eid, doc in docs.items()]
+        self._connection.executemany("INSERT OR IGNORE INTO entities (id, doc) VALUES (?, ?)", rows)
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+
+class EntityCache(object):
+    """
+    Bounded LRU cache of cleaned Wikidata entities, optionally backed by a SQLiteEntityStore shared between processes
+    """
+
+    def __init__(self, max_size=100000, path=None):
+        self._max_size = max_size
+        self._cache = OrderedDict()
+        self._store = SQLiteEntityStore(path) if path else None
+        self._hits = 0
+        self._store_hits = 0
+        self._misses = 0
+
+    def get_many(self, ids: Iterable[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Looks up the ids in memory first and then in the on disk store
+        :param ids:
+        :return: A dict with the entities found and the list of the ids not found
+        """
+        found = {}
+        missing = []
+        for eid in ids:
+            if eid in self._cache:
+                self._cache.move_to_end(eid)
+                found[eid] = self._cache[eid]
+            else:
+                missing.append(eid)
+        self._hits += len(found)
+
+        if self._store and missing:
+            stored = self._store.get_many(missing)
+            self._store_hits += len(stored)
+            self._add(stored)
+            found.update(stored)
+            missing = [eid for eid in missing if eid not in stored]
+
+        self._misses += len(missing)
+        return found, missing
+
+    def update(self, docs: Dict[str, Dict]):
+        """
+        Adds the entities retrieved from the database to the cache
+        :param docs:
+        :return:
+        """
+        self._add(docs)
+        if self._store and docs:
+            self._store.update(docs)
+
+    def _add(self, docs: Dict[str, Dict]):
+        for eid, doc in docs.items():
+            self._cache[eid] = doc
+            self._cache.move_to_end(eid)
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    def reset_stats(self):
+        """
+        Resets the counters, the cached entities are kept
+        """
+        self._hits = 0
+        self._store_hits = 0
+        self._misses = 0
+
+    def stats(self) -> Dict:
+        lookups = self._hits + self._store_hits + self._misses
+        hit_rate = (self._hits + self._store_hits) / lookups if lookups else 0.0
+        return {"cache_hits": self._hits, "cache_store_hits": self._store_hits, "cache_misses": self._misses,
+                "cache_hit_rate": round(hit_rate, 4), "cache_size": len(self._cache)}
+
+    def close(self):
+        if self._store:
+            self._store.close()
+
+    def __len__(self):
+        return len(self._cache)
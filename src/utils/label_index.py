@@ -0,0 +1,147 @@
+import json
+import mmap
+import os
+import re
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.utils import language_value
+
+DATA_FILE = "labels.data"
+INDEX_FILE = "{prefix}.idx"
+PREFIXES = ['Q', 'P']
+
+OFFSET = struct.Struct("<Q")
+FIELD_SEPARATOR = "\x1f"
+
+ID_RE = re.compile("^(?P<prefix>[QP])(?P<number>\\d+)$")
+
+
+def iter_dump(path: str) -> Iterable[Dict]:
+    """
+    Streams the entities of a Wikidata JSON dump, one entity per line
+    :param path:
+    :return:
+    """
+    with open(path, "rt", encoding="utf8") as inf:
+        for line in inf:
+            line = line.strip().rstrip(",")
+            if not line or line in {"[", "]"}:
+                continue
+            yield json.loads(line)
+
+
+def build_label_index(entities: Iterable[Dict], lang: str, out_path: str) -> int:
+    """
+    Writes the label and the aliases in lang of the entities to a memory mappable index. The records are written
+    to a data file, and for each id prefix an index file holds the offset of the record at the position of the
+    numeric part of the id
+    :param entities: Wikidata entities with at least the id, the labels and the aliases
+    :param lang:
+    :param out_path: The folder of the index
+    :return: The number of indexed entities
+    """
+    os.makedirs(out_path, exist_ok=True)
+    indexes = {prefix: open(os.path.join(out_path, INDEX_FILE.format(prefix=prefix)), "wb") for prefix in PREFIXES}
+    n = 0
+    try:
+        with open(os.path.join(out_path, DATA_FILE), "wb") as data:
+            for entity in entities:
+                match = ID_RE.match(entity.get('id', ''))
+                label = language_value(entity, 'labels', lang)
+                if not match or label is None:
+                    continue
+                label = label['value']
+                aliases = [alias['value'] for alias in language_value(entity, 'aliases', lang, [])]
+                record = FIELD_SEPARATOR.join([label] + aliases).replace("\n", " ") + "\n"
+
+                # The offset is shifted by one so that the holes of the index file read as missing
+                offset = data.tell() + 1
+                data.write(record.encode("utf8"))
+                index = indexes[match.group('prefix')]
+                index.seek(int(match.group('number')) * OFFSET.size)
+                index.write(OFFSET.pack(offset))
+                n += 1
+    finally:
+        for index in indexes.values():
+            index.close()
+
+    return n
+
+
+class LabelIndex(object):
+    """
+    Read only access to an index created with build_label_index
+    """
+
+    def __init__(self, path: str):
+        self._files = []
+        self._data = self._map(os.path.join(path, DATA_FILE))
+        self._indexes = {prefix: self._map(os.path.join(path, INDEX_FILE.format(prefix=prefix))) for prefix in
+                         PREFIXES}
+
+    def _map(self, path):
+        inf = open(path, "rb")
+        self._files.append(inf)
+        if not os.path.getsize(path):
+            return b""
+        return mmap.mmap(inf.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def get(self, entity_id: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Returns the label and the aliases of the entity, None if the entity is not in the index
+        :param entity_id:
+        :return:
+        """
+        match = ID_RE.match(entity_id)
+        if not match:
+            return None
+        index = self._indexes[match.group('prefix')]
+        position = int(match.group('number')) * OFFSET.size
+        if position + OFFSET.size > len(index):
+            return None
+        offset = OFFSET.unpack_from(index, position)[0]
+        if not offset:
+            return None
+        start = offset - 1
+        end = self._data.find(b"\n", start)
+        fields = self._data[start:end].decode("utf8").split(FIELD_SEPARATOR)
+        return fields[0], fields[1:]
+
+    def get_document(self, entity_id: str) -> Optional[Dict]:
+        """
+        Returns the entity in the same format of MergedWikisBuilder._clean_doc
+        :param entity_id:
+        :return:
+        """
+        res = self.get(entity_id)
+        if res is None:
+            return None
+        label, aliases = res
+        return {"id": entity_id, "label": label, "aliases": aliases}
+
+    def get_documents(self, ids: Iterable[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        Looks up a list of entities
+        :param ids:
+        :return: A dict with the entities found and the list of the ids not found
+        """
+        found = {}
+        missing = []
+        for entity_id in ids:
+            document = self.get_document(entity_id)
+            if document is None:
+                missing.append(entity_id)
+            else:
+                found[entity_id] = document
+        return found, missing
+
+    def __contains__(self, entity_id):
+        return self.get(entity_id) is not None
+
+    def close(self):
+        for mapped in [self._data] + list(self._indexes.values()):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        for inf in self._files:
+            inf.close()
@@ -0,0 +1,88 @@
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Sequence, Tuple
+
+
+class SubsequenceMatcher(object):
+    """
+    Aho-Corasick automaton over tokens. Finds all the occurrences, overlapping ones included, of a set of token
+    sequences with a single pass on the sequence, in time linear in its length plus the number of matches
+    """
+
+    def __init__(self, patterns: Iterable[Sequence[Hashable]]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._patterns = set()
+        for pattern in patterns:
+            pattern = tuple(pattern)
+            if pattern:
+                self._add(pattern)
+        self._build_failures()
+
+    def _add(self, pattern: Tuple):
+        if pattern in self._patterns:
+            return
+        self._patterns.add(pattern)
+        state = 0
+        for token in pattern:
+            if token not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][token] = len(self._goto) - 1
+            state = self._goto[state][token]
+        self._output[state].append(pattern)
+
+    def _build_failures(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, sequence: Sequence[Hashable], as_list=False) -> Dict[Tuple, List]:
+        """
+        Finds the occurrences of all the patterns in the sequence
+        :param sequence:
+        :param as_list: If the locations are returned as lists instead of ranges
+        :return: A dict with the patterns, as tuples, as keys, and the list of their locations as value
+        """
+        res = {pattern: [] for pattern in self._patterns}
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for i, token in enumerate(sequence):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pattern in output[state]:
+                location = range(i - len(pattern) + 1, i + 1)
+                res[pattern].append(list(location) if as_list else location)
+        return res
+
+    def find(self, sequence: Sequence[Hashable], pattern: Sequence[Hashable], as_list=False) -> List:
+        """
+        Returns the locations of one of the patterns of the automaton in the sequence
+        :param sequence:
+        :param pattern:
+        :param as_list: If the locations are returned as lists instead of ranges
+        :return:
+        """
+        return self.find_all(sequence, as_list).get(tuple(pattern), [])
+
+
+def find_full_matches(sequence: Sequence[Hashable], pattern: Sequence[Hashable], as_list=False) -> List:
+    """
+    Returns the locations of all the occurrences of pattern in sequence
+    :param sequence:
+    :param pattern:
+    :param as_list: If the locations are returned as lists instead of ranges
+    :return:
+    """
+    return SubsequenceMatcher([pattern]).find(sequence, pattern, as_list)
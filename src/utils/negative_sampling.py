@@ -0,0 +1,66 @@
+import random
+from bisect import bisect_right
+from collections import defaultdict
+from itertools import accumulate
+from typing import Dict, Iterator, List, Set, Tuple
+
+from utils.distant_supervision import MultiPatternMatcher
+
+
+def answers_in_sentences(examples: List[Dict]) -> Dict[str, Set[str]]:
+    """
+    Indexes which answers of the examples occur, delimited by word boundaries, in the sentences of the examples
+    :param examples: The examples with a sentence and an answer
+    :return: A dict with the sentences as keys, and the set of the answers they contain as value
+    """
+    matcher = MultiPatternMatcher({example['answer'] for example in examples})
+    return {sentence: matcher.find_all(sentence) for sentence in {example['sentence'] for example in examples}}
+
+
+def negative_pairs(examples: List[Dict], found: Dict[str, Set[str]], max_per_property=None,
+                   seed=None) -> Iterator[Tuple[int, int]]:
+    """
+    Finds the pairs (a, b) of examples, with a before b, that make a negative example: the question of the property of
+    a on the sentence of b, that does not contain the answer of a. When a property has more candidate pairs than
+    max_per_property, at most max_per_property of them are sampled uniformly, so the time does not depend on the
+    number of the examples
+    :param examples: The examples of the same type
+    :param found: The answers in the sentences, as returned by answers_in_sentences
+    :param max_per_property: Maximum number of negatives of a property, all of them when None
+    :param seed: The seed of the sampling
+    :return: An iterator over the positions of the pairs
+    """
+    positions = defaultdict(list)
+    for i, example in enumerate(examples):
+        positions[example['prop_id']].append(i)
+
+    rnd = random.Random(seed)
+    size = len(examples)
+    for prop, prop_positions in positions.items():
+        # The candidates of a are the examples of the other properties after it
+        counts = [size - 1 - i - (len(prop_positions) - 1 - k) for k, i in enumerate(prop_positions)]
+        total = sum(counts)
+        if max_per_property is None or total <= max_per_property:
+            others = [j for other, other_positions in positions.items() if other != prop for j in other_positions]
+            others.sort()
+            for i in prop_positions:
+                answer = examples[i]['answer']
+                for j in others[bisect_right(others, i):]:
+                    if answer not in found[examples[j]['sentence']]:
+                        yield i, j
+            continue
+
+        # Weighting a by all the examples after it and rejecting the ones of the same property samples the pairs
+        # uniformly
+        cum_weights = list(accumulate(size - 1 - i for i in prop_positions))
+        sampled = set()
+        for _ in range(3 * max_per_property):
+            if len(sampled) >= max_per_property:
+                break
+            i = rnd.choices(prop_positions, cum_weights=cum_weights)[0]
+            j = rnd.randrange(i + 1, size)
+            if examples[j]['prop_id'] == prop or (i, j) in sampled \
+                    or examples[i]['answer'] in found[examples[j]['sentence']]:
+                continue
+            sampled.add((i, j))
+        yield from sorted(sampled)
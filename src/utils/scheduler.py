@@ -0,0 +1,125 @@
+import logging
+from typing import Dict, Iterable, Iterator, Tuple
+
+
+def cost_expression(text_field="text", facts_field="facts"):
+    """
+    Builds the aggregation expression that estimates the cost of building a document as the size of the text times
+    the number of properties with facts
+    :param text_field:
+    :param facts_field: The field with the facts, the cost only depends on the text when None
+    :return:
+    """
+    text_size = {"$strLenBytes": {"$ifNull": ["$" + text_field, ""]}}
+    if not facts_field:
+        return text_size
+    facts_size = {"$size": {"$objectToArray": {"$ifNull": ["$" + facts_field, {}]}}}
+    return {"$multiply": [text_size, {"$add": [1, facts_size]}]}
+
+
+def stream_costs(collection, key, cost):
+    """
+    Streams the key and the estimated cost of the documents of the collection sorted by key
+    :param collection:
+    :param key:
+    :param cost: The aggregation expression of the cost
+    :return:
+    """
+    pipeline = [{"$sort": {key: 1}}, {"$project": {"_id": 0, key: 1, "cost": cost}}]
+    return collection.aggregate(pipeline, allowDiskUse=True, batchSize=10000)
+
+
+def total_cost(collection, cost, sample_size=1000) -> Tuple[int, int]:
+    """
+    Estimates the total cost of the documents of the collection as the number of documents, from the metadata of the
+    collection, times the average cost of a random sample of them, so the estimate does not scan the whole collection
+    :param collection:
+    :param cost: The aggregation expression of the cost
+    :param sample_size: The number of documents of the sample
+    :return: The total cost and the number of documents
+    """
+    count = collection.estimated_document_count()
+    if not count:
+        return 0, 0
+    pipeline = [{"$sample": {"size": sample_size}}, {"$group": {"_id": None, "cost": {"$avg": cost}}}]
+    result = list(collection.aggregate(pipeline, allowDiskUse=True))
+    return (int(result[0]['cost'] * count), count) if result else (0, 0)
+
+
+def get_guided_chunks(sequence: Iterable[Dict], total: int, count: int, num_workers: int, key: str, min_size=50,
+                      max_size=1000) -> Iterator[Tuple]:
+    """
+    Computes the lower and upper limits of chunks of similar cost. The target cost of a chunk is a fraction of the
+    remaining cost, so the chunks get smaller towards the end of the collection and the last ones can be spread on
+    the idle workers instead of waiting for a single big chunk. A document that costs more than a full chunk of
+    average documents gets a chunk on its own
+    :param sequence: An iterable of documents sorted by key with their estimated cost
+    :param total: The total cost of the documents
+    :param count: The number of documents
+    :param num_workers:
+    :param key:
+    :param min_size: Minimum number of average documents of a chunk
+    :param max_size: Maximum number of documents of a chunk
+    :return: The doc id for the lower and upper limits
+    """
+    average = total / count if count else 0
+    heavy = average * max_size
+    remaining = total
+    lower = None
+    upper = None
+    size = 0
+    cost = 0
+    target = 0
+    for doc in sequence:
+        doc_cost = doc.get('cost', 0)
+        if size and doc_cost > heavy:
+            yield (lower, upper)
+            remaining -= cost
+            size = 0
+            cost = 0
+
+        if not size:
+            lower = doc[key]
+            target = max(remaining / (2 * num_workers), average * min_size)
+        upper = doc[key]
+        size += 1
+        cost += doc_cost
+        if size >= max_size or cost >= target or doc_cost > heavy:
+            yield (lower, upper)
+            remaining -= cost
+            size = 0
+            cost = 0
+
+    if size:
+        yield (lower, upper)
+
+
+def plan_chunks(collection, key, cost, ledger, num_workers, min_size, max_size) -> Iterator[Tuple]:
+    """
+    Plans the guided chunks of the collection that are not completed in the checkpoint ledger. The chunks completed
+    are keyed by their limits, which depend on the planning parameters and on the estimated total cost, so they are
+    stored in the ledger by the first run and reused when resuming: changing them in the config has no effect until
+    the ledger is deleted. The collection must not change between the runs
+    :param collection:
+    :param key:
+    :param cost: The aggregation expression of the cost
+    :param ledger: The CheckpointLedger of the driver
+    :param num_workers:
+    :param min_size: Minimum number of average documents of a chunk
+    :param max_size: Maximum number of documents of a chunk
+    :return: The doc id for the lower and upper limits of the chunks to build
+    """
+    parameters = {"num_workers": num_workers, "min_size": min_size, "max_size": max_size}
+    plan = ledger.plan()
+    if plan is None:
+        plan = dict(parameters)
+        plan['total'], plan['count'] = total_cost(collection, cost)
+        ledger.set_plan(plan)
+    elif any(plan[name] != value for name, value in parameters.items()):
+        logging.warning("Resuming with the chunk plan of the checkpoint {}, delete it to use {}".format(
+            {name: plan[name] for name in parameters}, parameters))
+
+    done = ledger.done_chunks()
+    chunks = get_guided_chunks(stream_costs(collection, key, cost), plan['total'], plan['count'],
+                               plan['num_workers'], key, plan['min_size'], plan['max_size'])
+    return (chunk for chunk in chunks if (str(chunk[0]), str(chunk[1])) not in done)
@@ -0,0 +1,93 @@
+import traceback
+from typing import Callable, Dict, List
+
+from pymongo.errors import BulkWriteError
+
+from tokenizers.utils import align_tokens
+
+
+class SentenceStore(object):
+    """
+    Sentence segmentation backed by a sidecar collection with the sentence boundaries of the texts, keyed by the hash
+    of the text and the language, so the builders reading the same articles split each of them only once
+    """
+
+    def __init__(self, segmenter: Callable[[str], List[str]], language: str, get_id: Callable[[str], str],
+                 collection=None):
+        """
+        :param segmenter: The function that splits a text in sentences
+        :param language: The language of the segmenter, part of the key
+        :param get_id: The function that hashes the texts
+        :param collection: The sidecar collection, the texts are always segmented when None
+        """
+        self._segmenter = segmenter
+        self._language = language
+        self._get_id = get_id
+        self._collection = collection
+        self._hits = 0
+        self._misses = 0
+
+    def _key(self, text: str) -> str:
+        return "{}_{}".format(self._language, self._get_id(text))
+
+    def split(self, text: str) -> List[str]:
+        return self.split_batch([text])[0]
+
+    def split_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Splits the texts in sentences, reading the boundaries of the texts already segmented with a single query and
+        storing the ones of the others
+        :param texts:
+        :return: The list of the sentences of each text
+        """
+        if self._collection is None:
+            return [self._segmenter(text) if text else [] for text in texts]
+
+        keys = {self._key(text): text for text in texts if text}
+        stored = self._load(list(keys))
+        segmented = {}
+        new = []
+        for key, text in keys.items():
+            if key in stored:
+                self._hits += 1
+                segmented[key] = [text[start:end] for start, end in stored[key]]
+                continue
+            self._misses += 1
+            sentences = self._segmenter(text)
+            segmented[key] = sentences
+            try:
+                boundaries = [list(span) for span in align_tokens(sentences, text)]
+            except ValueError:
+                # The segmenter changed the text, the sentences can't be rebuilt from boundaries
+                continue
+            new.append({"_id": key, "boundaries": boundaries})
+
+        self._store(new)
+        return [segmented[self._key(text)] if text else [] for text in texts]
+
+    def _load(self, keys: List[str]) -> Dict[str, List]:
+        if not keys:
+            return {}
+        return {doc['_id']: doc['boundaries'] for doc in self._collection.find({"_id": {"$in": keys}})}
+
+    def _store(self, docs: List[Dict]):
+        if not docs:
+            return
+        try:
+            self._collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # Another worker stored the same texts in the meantime
+            if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                traceback.print_exc()
+
+    def reset_stats(self):
+        """
+        Resets the counters, so the stats of a builder reused across chunks are the ones of its current chunk
+        """
+        self._hits = 0
+        self._misses = 0
+
+    def stats(self):
+        lookups = self._hits + self._misses
+        return {"sentence_store_hits": self._hits, "sentence_store_misses": self._misses,
+                "sentence_store_hit_rate": round(self._hits / lookups, 4) if lookups else 0.0}
@@ -1,14 +1,49 @@
 import re
 from abc import ABC
+from functools import lru_cache
+
+WHITESPACES_RE = re.compile("\\s{2,}")
 
 
 class TemplateFillerI(ABC):
+    """
+    Fills the question templates with the entity label. The filled questions are memoized on the template, the entity
+    and its article, and the subclasses prepare each template once for every article in a fill plan, so that only the
+    entity dependent steps run for each question
+    """
+
+    def __init__(self, max_size=100000):
+        """
+        :param max_size: Maximum number of memoized questions
+        """
+        self._fill_cached = lru_cache(maxsize=max_size)(self._fill)
+        self._plans = {}
+
     def fill(self, template: str, entity: str, **kwargs):
+        return self._fill_cached(template, entity, kwargs.get('article', ''))
+
+    def _fill(self, template: str, entity: str, article: str):
         return template.replace("XXX", entity)
 
+    def _plan(self, template: str, *args):
+        """
+        Returns the fill plan of the template, prepared on the first use
+        :param template:
+        :param args: The entity independent choices that determine the plan
+        :return:
+        """
+        key = (template,) + args
+        if key not in self._plans:
+            self._plans[key] = self._make_plan(template, *args)
+        return self._plans[key]
+
+    def _make_plan(self, template: str, *args):
+        return template
+
 
 class ItalianTemplateFiller(TemplateFillerI):
-    def __init__(self):
+    def __init__(self, max_size=100000):
+        super().__init__(max_size)
         self._reduction_rules = {'diil': 'del', 'dilo': 'dello', 'dila': 'della', 'dii': 'dei', 'digli': 'degli',
                                  'dile': 'delle', 'dil': 'dell\'',
                                  'ail': 'al', 'alo': 'allo', 'ala': 'alla', 'ai': 'ai', 'agli': 'agli', 'ale': 'alle',
@@ -27,14 +62,34 @@ class ItalianTemplateFiller(TemplateFillerI):
                                                         for preposition in self._reduction_rules.keys()]) + ")"
         self._finder = re.compile(self._template, re.IGNORECASE)
         self._articles_gender = {'il': 'o', 'lo': 'o', 'i': 'i', 'gli': 'i', 'la': 'a', 'le': 'e'}
+        self._preposition_re = re.compile("(di|a|da|in|con|su|per)YYY")
+        self._article_res = {}
 
-    def fill(self, template: str, entity: str, **kwargs):
-        article = kwargs['article'].lower()
+    def _fill(self, template: str, entity: str, article: str):
+        article = article.lower()
         article_in_entity = True if entity.lower().startswith(article) else False
 
+        template, remove_article = self._plan(template, article, article_in_entity)
+        if remove_article:
+            entity = self._article_re(article).sub("", entity, 1)
+        template = template.replace("XXX", entity)
+        if '\' ' + entity in template:
+            template = template.replace("\' ", "\'")
+        template = WHITESPACES_RE.sub(" ", template)
+        return template
+
+    def _make_plan(self, template: str, article: str, article_in_entity: bool):
+        """
+        Prepares the article, the preposition and the gender of the template
+        :param template:
+        :param article:
+        :param article_in_entity:
+        :return: The template with only the entity left to fill, and if the article has to be removed from the entity
+        """
+        remove_article = False
         if article:
-            if article_in_entity and re.search("(di|a|da|in|con|su|per)YYY", template):
-                entity = re.sub("\\b" + article + "\\b", "", entity, 1, re.IGNORECASE)
+            if article_in_entity and self._preposition_re.search(template):
+                remove_article = True
                 template = template.replace("YYY", article)
             elif article_in_entity:
                 template = template.replace("YYY", "")
@@ -46,11 +101,12 @@ class ItalianTemplateFiller(TemplateFillerI):
 
         gender = self._articles_gender.get(article, 'o')
         template = template.replace("GGG", gender)
-        template = template.replace("XXX", entity)
-        if '\' ' + entity in template:
-            template = template.replace("\' ", "\'")
-        template = re.sub("\s{2,}", " ", template)
-        return template
+        return template, remove_article
+
+    def _article_re(self, article):
+        if article not in self._article_res:
+            self._article_res[article] = re.compile("\\b" + article + "\\b", re.IGNORECASE)
+        return self._article_res[article]
 
     def _reduce(self, template):
         match = self._finder.search(template)
@@ -62,46 +118,62 @@ class ItalianTemplateFiller(TemplateFillerI):
 
 
 class FrenchTemplateFiller(TemplateFillerI):
-    def __init__(self):
+    def __init__(self, max_size=100000):
+        super().__init__(max_size)
         self._vowels = {'a', 'e', 'i', 'o', 'u', 'â', 'ê', 'î', 'ô', 'û', 'ë', 'ï', 'ü', 'y', 'ÿ', 'à', 'è', 'ù', 'é'}
+        self._elision_re = re.compile("de\\sXXX")
 
-    def fill(self, template: str, entity: str, **kwargs):
-        if re.search("de\sXXX", template) and entity[0].lower() in self._vowels:
-            template = re.sub("de\sXXX", "d'XXX", template)
-
+    def _fill(self, template: str, entity: str, article: str):
+        template = self._plan(template, entity[:1].lower() in self._vowels)
         template = template.replace("XXX", entity)
-        template = re.sub("\s{2,}", " ", template)
+        template = WHITESPACES_RE.sub(" ", template)
         return template.strip()
 
+    def _make_plan(self, template: str, vowel: bool):
+        if vowel and self._elision_re.search(template):
+            template = self._elision_re.sub("d'XXX", template)
+        return template
+
 
 class GermanTemplateFiller(TemplateFillerI):
-    def fill(self, template: str, entity: str, **kwargs):
-        article = kwargs['article'].lower()
+    def _fill(self, template: str, entity: str, article: str):
+        article = article.lower()
 
         article_in_entity = True if entity.lower().startswith(article) else False
         if article_in_entity:
             article = ""
-        template = re.sub("YYY", article, template)
+        template = self._plan(template, article)
         template = template.replace("XXX", entity)
-        template = re.sub("\s{2,}", " ", template)
+        template = WHITESPACES_RE.sub(" ", template)
         template = template.strip()
         template = template[0].upper() + template[1:]
         return template.strip()
 
+    def _make_plan(self, template: str, article: str):
+        return re.sub("YYY", article, template)
+
 
 class SpanishTemplateFiller(TemplateFillerI):
-    def __init__(self):
+    def __init__(self, max_size=100000):
+        super().__init__(max_size)
         self._articles_gender = {'el': 'o', 'la': 'a', 'los': 'es', 'las': 'as'}
 
-    def fill(self, template: str, entity: str, **kwargs):
-        article = kwargs['article'].lower()
+    def _fill(self, template: str, entity: str, article: str):
+        article = article.lower()
         article_in_entity = True if entity.lower().startswith(article) else False
+        template = self._plan(template, article, article_in_entity)
+        template = template.replace("XXX", entity)
+        template = WHITESPACES_RE.sub(" ", template)
+
+        return template
+
+    def _make_plan(self, template: str, article: str, article_in_entity: bool):
         skip = False
-        if article_in_entity and not re.search("(de)YYY", template):
+        if article_in_entity and "deYYY" not in template:
             skip = True
 
         if article and not skip:
-            if article == "el" and re.search("(de)YYY", template):
+            if article == "el" and "deYYY" in template:
                 template = template.replace("deYYY", 'del')
             else:
                 template = template.replace("YYY", " " + article)
@@ -110,9 +182,6 @@ class SpanishTemplateFiller(TemplateFillerI):
 
         gender = self._articles_gender.get(article, 'o')
         template = template.replace("GGG", gender)
-        template = template.replace("XXX", entity)
-        template = re.sub("\s{2,}", " ", template)
-
         return template
 
 
@@ -1,5 +1,7 @@
 import csv
 
+from utils import matcher
+
 
 def find_full_matches(sequence, answer):
     return find_sub_list(answer, sequence)
@@ -11,13 +13,7 @@ def find_matches(sequence, answer):
 
 
 def find_sub_list(sublist, list):
-    results = []
-    sll = len(sublist)
-    for ind in (i for i, e in enumerate(list) if e == sublist[0]):
-        if list[ind:ind + sll] == sublist:
-            results.append(range(ind, ind + sll))
-
-    return results
+    return matcher.find_full_matches(list, sublist)
 
 
 def is_sublist(sublist, list):
@@ -35,18 +31,56 @@ def is_sublist(sublist, list):
 
 def get_chunks(sequence, chunk_size, key):
     """
-    Computes the lower limit and the upper limit of a collection of documents
-    :param sequence:
+    Computes the lower limit and the upper limit of a collection of documents. The sequence is consumed as a stream,
+    so a sorted cursor can be used directly without loading all the documents
+    :param sequence: An iterable of documents sorted by key
     :param chunk_size:
+    :param key:
     :return: The doc id for the lower and upper limits
     """
-    for j in range(0, len(sequence), chunk_size):
-        chunck = sequence[j:j + chunk_size]
-        lower = chunck[0][key]
-        upper = chunck[-1][key]
+    lower = None
+    upper = None
+    size = 0
+    for doc in sequence:
+        if not size:
+            lower = doc[key]
+        upper = doc[key]
+        size += 1
+        if size == chunk_size:
+            yield (lower, upper)
+            size = 0
+
+    if size:
         yield (lower, upper)
 
 
+def wikidata_projection(lang, claims=False):
+    """
+    Builds the projection that limits the Wikidata documents to the id, the label and the aliases in the language
+    :param lang:
+    :param claims: If the claims of the entity are needed
+    :return:
+    """
+    projection = {"_id": 0, "id": 1, "labels.{}".format(lang): 1, "aliases.{}".format(lang): 1}
+    if claims:
+        projection["claims"] = 1
+    return projection
+
+
+def language_value(entity, key, lang, default=None):
+    """
+    Returns the value in the language of a multilingual field of a Wikidata entity, as the labels or the aliases.
+    Wikibase writes the empty maps as [], so the field is not always a dict
+    :param entity:
+    :param key: The field, as 'labels', 'descriptions' or 'aliases'
+    :param lang:
+    :param default: The value when the field has nothing in the language
+    :return:
+    """
+    values = entity.get(key)
+    return values.get(lang, default) if isinstance(values, dict) else default
+
+
 def load_props(path="/resources/levy_et_al_properties.txt"):
     omer_props = set()
     with open(path, "rt", encoding="utf8") as inf:
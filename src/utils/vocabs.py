@@ -1,6 +1,8 @@
 import csv
+from array import array
 from collections import Counter
 from itertools import chain
+from typing import Dict, Iterable, List
 
 from pymongo import MongoClient
 
@@ -24,6 +26,57 @@ def load_vocab(path):
     return vocab
 
 
+class Vocabulary(object):
+    """
+    Maps the tokens to the integer ids of a vocabulary saved with save_vocab
+    """
+
+    def __init__(self, token_ids: Dict[str, int], unk="<UNK>"):
+        self._token_ids = token_ids
+        self._unk_id = token_ids[unk]
+        self._size = max(token_ids.values()) + 1
+
+    @classmethod
+    def load(cls, path):
+        token_ids = {}
+        with open(path, "rt", encoding="utf8") as inf:
+            reader = csv.reader(inf, delimiter="\t")
+            for key, token, count in reader:
+                token_ids.setdefault(token, int(key))
+
+        return cls(token_ids)
+
+    def encode(self, tokens: Iterable[str], oov: Dict[str, int] = None) -> array:
+        """
+        Encodes the tokens to an array of ids. When oov is given, the tokens not in the vocabulary are interned in it
+        with ids after the vocabulary ones instead of <UNK>, so that sequences can be compared exactly on the ids
+        :param tokens:
+        :param oov: Dict of the out of vocabulary tokens, shared by the sequences that are compared
+        :return:
+        """
+        ids = array('i')
+        for token in tokens:
+            token_id = self._token_ids.get(token)
+            if token_id is None:
+                token_id = self._unk_id if oov is None else oov.setdefault(token, self._size + len(oov))
+            ids.append(token_id)
+        return ids
+
+    def to_ids(self, ids: Iterable[int]) -> List[int]:
+        """
+        Converts an encoded sequence to the list of its vocabulary ids, the interned tokens become <UNK>
+        :param ids:
+        :return:
+        """
+        return [token_id if token_id < self._size else self._unk_id for token_id in ids]
+
+    def get(self, token: str) -> int:
+        return self._token_ids.get(token, self._unk_id)
+
+    def __len__(self):
+        return self._size
+
+
 # TODO Fix vocabs creation
 
 def build_document_vocab(collection, out_path):